@@ -0,0 +1,92 @@
+"""
+Short-lived cache of decoded tokens and active users for authenticated requests.
+
+User records are dropped by every UPDATE or DELETE made through the User
+model (save, delete_instance, and bulk User.update / User.delete queries).
+Writes this process cannot see, from another worker process or raw SQL, are
+only picked up when the cached record expires, up to AUTH_CACHE_TTL_SECONDS
+later: keep that TTL short, or run such writes through the model.
+"""
+import hashlib
+import time
+from typing import Optional
+from cache import TTLCache, MISSING
+from config import settings
+
+
+# Decoded token claims keyed by token hash, and user records keyed by user ID
+auth_cache = TTLCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def _token_key(token: str) -> tuple:
+    """Cache key of a token (its SHA256 hash, so raw tokens are never kept)."""
+    return ("token", hashlib.sha256(token.encode('utf-8')).hexdigest())
+
+
+def get_cached_claims(token: str) -> Optional[dict]:
+    """
+    Get the cached claims of a token.
+
+    Args:
+        token: JWT token
+
+    Returns:
+        Decoded claims, or None if not cached
+    """
+    claims = auth_cache.get(_token_key(token), "claims")
+    return None if claims is MISSING else claims
+
+
+def cache_claims(token: str, claims: dict):
+    """
+    Cache the decoded claims of a valid token, never beyond its expiration.
+
+    Args:
+        token: JWT token
+        claims: Decoded claims
+    """
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    if "exp" in claims:
+        ttl = min(ttl, claims["exp"] - time.time())
+    if ttl > 0:
+        auth_cache.set(_token_key(token), "claims", claims, ttl)
+
+
+def get_cached_user(id_user: str) -> Optional[dict]:
+    """
+    Get the cached record of a user.
+
+    Args:
+        id_user: User ID
+
+    Returns:
+        User field values, or None if not cached
+    """
+    data = auth_cache.get(("user", id_user), "data")
+    return None if data is MISSING else data
+
+
+def cache_user(id_user: str, data: dict):
+    """
+    Cache the record of a user.
+
+    Args:
+        id_user: User ID
+        data: User field values
+    """
+    auth_cache.set(("user", id_user), "data", data, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(id_user: str):
+    """
+    Drop the cached record of a user (call whenever the user changes).
+
+    Args:
+        id_user: User ID
+    """
+    auth_cache.invalidate(("user", id_user))
+
+
+def invalidate_users():
+    """Drop every cached user record (and token claims, which are cheap to decode again)."""
+    auth_cache.clear()
@@ -1,16 +1,60 @@
 """
 FastAPI dependencies for authentication.
 """
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.datastructures import Headers
+from config import settings
+from database import run_in_db_executor
+from timing import span
 from auth.security import decode_token
 from auth.models import User
+from auth.cache import get_cached_claims, cache_claims, get_cached_user, cache_user
 
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
+def user_from_token(token: str) -> Optional[User]:
+    """
+    Resolve the user a JWT access token belongs to (blocking).
+
+    Decoded claims and user records are cached for AUTH_CACHE_TTL_SECONDS;
+    User writes through the model invalidate the cached records they touch
+    (see auth.cache).
+
+    Args:
+        token: Encoded JWT token
+
+    Returns:
+        User object, or None if the token is invalid or the user does not exist
+    """
+    payload = get_cached_claims(token)
+    if payload is None:
+        payload = decode_token(token)
+        if payload is None:
+            return None
+        cache_claims(token, payload)
+
+    # Extract id_user from token
+    id_user: str = payload.get("sub")
+    if id_user is None:
+        return None
+
+    # Get user from cache or database
+    data = get_cached_user(id_user)
+    if data is not None:
+        return User(**data)
+    try:
+        user = User.get_by_id(id_user)
+    except User.DoesNotExist:
+        return None
+    cache_user(id_user, dict(user.__data__))
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
@@ -26,29 +70,15 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    # Decode token
-    token = credentials.credentials
-    payload = decode_token(token)
+    with span("auth"):
+        user = await run_in_db_executor(user_from_token, credentials.credentials)
 
-    if payload is None:
-        raise credentials_exception
-
-    # Extract id_user from token
-    id_user: str = payload.get("sub")
-    if id_user is None:
-        raise credentials_exception
-
-    # Get user from database
-    try:
-        user = User.get_by_id(id_user)
-    except User.DoesNotExist:
-        raise credentials_exception
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     # Check if user is active
     if not user.is_active:
@@ -58,3 +88,20 @@ async def get_current_user(
         )
 
     return user
+
+
+async def is_admin_request(headers: Headers) -> bool:
+    """
+    Check whether a request is authenticated as an admin (see ADMIN_USERNAMES).
+
+    Args:
+        headers: Request headers
+
+    Returns:
+        True if the bearer token belongs to an active admin user
+    """
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token or not settings.admin_usernames_list:
+        return False
+    user = await run_in_db_executor(user_from_token, token)
+    return user is not None and user.is_active and user.username in settings.admin_usernames_list
@@ -4,11 +4,43 @@ User authentication models.
 from datetime import datetime
 from peewee import (
     Model,
+    ModelDelete,
+    ModelUpdate,
     CharField,
     BooleanField,
     DateTimeField,
 )
 from database import db
+from auth.cache import invalidate_user, invalidate_users
+
+
+class _InvalidatingWrite:
+    """
+    UPDATE or DELETE query on users dropping the cached records of the rows it touches.
+
+    The IDs of the matched users are read before the write; a write without
+    WHERE clause drops every cached user.
+    """
+
+    def _execute(self, database):
+        if self._where is None:
+            result = super()._execute(database)
+            invalidate_users()
+            return result
+
+        id_users = [id_user for (id_user,) in self.model.select(self.model.id_user).where(self._where).tuples()]
+        result = super()._execute(database)
+        for id_user in id_users:
+            invalidate_user(id_user)
+        return result
+
+
+class _UserUpdate(_InvalidatingWrite, ModelUpdate):
+    """UPDATE query on users (see _InvalidatingWrite)."""
+
+
+class _UserDelete(_InvalidatingWrite, ModelDelete):
+    """DELETE query on users (see _InvalidatingWrite)."""
 
 
 class User(Model):
@@ -26,5 +58,15 @@ class User(Model):
         database = db
         table_name = 'users'
 
+    # Every update and delete, including those of save() and delete_instance(),
+    # drops the cached records of the users it touches (see auth.cache)
+    @classmethod
+    def update(cls, __data=None, **update):
+        return _UserUpdate(cls, cls._normalize_data(__data, update))
+
+    @classmethod
+    def delete(cls):
+        return _UserDelete(cls)
+
     def __repr__(self):
         return f"<User {self.username} ({self.email})>"
@@ -3,16 +3,65 @@ Authentication API routes.
 """
 import uuid
 from datetime import datetime
+from functools import partial
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from peewee import IntegrityError
+from database import run_in_db_executor
+from metrics import InstrumentedRoute
 from auth.models import User
 from auth.schemas import UserRegister, Token, UserResponse
-from auth.security import hash_password, verify_password, create_access_token, create_refresh_token, decode_token
+from auth.security import (
+    hash_password,
+    verify_and_update_password,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    password_hasher,
+    PasswordHasherBusy,
+)
 from auth.dependencies import get_current_user
 
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=InstrumentedRoute)
+
+
+async def _run_password_work(func, *args):
+    """
+    Run password hashing work in the dedicated hashing pool.
+
+    Args:
+        func: Blocking hashing function
+        *args: Positional arguments passed to func
+
+    Returns:
+        Result of func
+
+    Raises:
+        HTTPException: If the hashing pool is saturated
+    """
+    try:
+        return await password_hasher.run(func, *args)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _find_user(login: str) -> Optional[User]:
+    """
+    Find a user by username, or else by email (blocking).
+
+    Args:
+        login: Username or email
+
+    Returns:
+        User object, or None if no user matches
+    """
+    return User.get_or_none(User.username == login) or User.get_or_none(User.email == login)
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
@@ -28,15 +77,16 @@ async def register(user_data: UserRegister, response: Response):
         Access token
 
     Raises:
-        HTTPException: If email or username already exists
+        HTTPException: If email or username already exists, or the service is busy
     """
+    # Hash password
+    hashed_password = await _run_password_work(hash_password, user_data.password)
+
     # Check if user already exists
     try:
-        # Hash password
-        hashed_password = hash_password(user_data.password)
-
         # Create user
-        user = User.create(
+        user = await run_in_db_executor(partial(
+            User.create,
             id_user=str(uuid.uuid4()),
             email=user_data.email,
             username=user_data.username,
@@ -44,7 +94,7 @@ async def register(user_data: UserRegister, response: Response):
             is_active=True,
             created_at=datetime.now(),
             updated_at=datetime.now()
-        )
+        ))
 
         # Generate tokens
         access_token = create_access_token(data={"sub": user.id_user})
@@ -97,20 +147,19 @@ async def login(
         Access token
 
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid, or the service is busy
     """
     # Try to find user by username or email
-    user = None
-    try:
-        user = User.get(User.username == form_data.username)
-    except User.DoesNotExist:
-        try:
-            user = User.get(User.email == form_data.username)
-        except User.DoesNotExist:
-            pass
+    user = await run_in_db_executor(_find_user, form_data.username)
 
     # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await _run_password_work(
+            verify_and_update_password, form_data.password, user.hashed_password
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username/email or password",
@@ -138,9 +187,11 @@ async def login(
         max_age=7 * 24 * 60 * 60  # 7 days
     )
 
-    # Update last login timestamp
+    # Update last login timestamp, and the password hash if its cost factor changed
+    if new_hash:
+        user.hashed_password = new_hash
     user.updated_at = datetime.now()
-    user.save()
+    await run_in_db_executor(user.save)
 
     return Token(access_token=access_token)
 
@@ -207,9 +258,8 @@ async def refresh_access_token(request: Request, response: Response):
         )
 
     # Get user from database
-    try:
-        user = User.get_by_id(id_user)
-    except User.DoesNotExist:
+    user = await run_in_db_executor(User.get_or_none, User.id_user == id_user)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
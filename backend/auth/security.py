@@ -1,16 +1,131 @@
 """
 Security utilities for password hashing and JWT token management.
 """
+import asyncio
 import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from config import settings
+from metrics import observe_password_hash
 
 
-# Password hashing context (bcrypt with 12 rounds)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context (bcrypt, hashes with another cost factor need an update)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when no password hashing worker frees up within the queue timeout."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt work in a dedicated, size-limited thread pool.
+
+    Keeps CPU-heavy hashing off the event loop and bounds how many requests
+    can queue for it: callers waiting longer than the queue timeout get
+    PasswordHasherBusy instead of piling up.
+    """
+
+    def __init__(self, workers: int, queue_timeout: float):
+        """
+        Args:
+            workers: Number of hashing threads
+            queue_timeout: Maximum time in seconds to wait for a free worker
+        """
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.queue_depth = 0  # Callers waiting for a free worker
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._slots = asyncio.Semaphore(workers)
+        self._lock = threading.Lock()
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run a password hashing function in the pool.
+
+        Args:
+            func: Blocking hashing function
+            *args: Positional arguments passed to func
+
+        Returns:
+            Result of func
+
+        Raises:
+            PasswordHasherBusy: If no worker frees up within the queue timeout
+        """
+        queued_at = time.perf_counter()
+        self.queue_depth += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        finally:
+            self.queue_depth -= 1
+
+        started_at = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the job itself is done, even if the caller
+        # is cancelled meanwhile: the worker thread stays busy until then
+        future.add_done_callback(lambda done: self._finished(done, queued_at, started_at))
+        return await asyncio.shield(future)
+
+    def _finished(self, future: asyncio.Future, queued_at: float, started_at: float):
+        """Free the slot of a finished job and record its latency (event loop)."""
+        self._slots.release()
+        if future.cancelled():
+            # Dropped from the executor queue at shutdown, nothing was hashed
+            return
+        finished_at = time.perf_counter()
+        observe_password_hash(started_at - queued_at, finished_at - started_at)
+        with self._lock:
+            self.completed += 1
+            self.total_wait_seconds += started_at - queued_at
+            self.total_hash_seconds += finished_at - started_at
+
+    def stats(self) -> dict:
+        """
+        Get hashing queue counters.
+
+        Returns:
+            Dictionary with queue depth (callers waiting for a worker),
+            completed and rejected counts, and
+            average wait and hashing latency in milliseconds
+        """
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "queueDepth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avgWaitMs": round(self.total_wait_seconds / completed * 1000, 2),
+            "avgHashMs": round(self.total_hash_seconds / completed * 1000, 2),
+        }
+
+    def shutdown(self):
+        """Shut down the hashing pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared hasher used by the authentication routes
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+)
 
 
 def hash_password(password: str) -> str:
@@ -49,6 +164,22 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password_hash, hashed_password)
 
 
+def verify_and_update_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash uses another cost factor.
+
+    Args:
+        password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        Tuple of (matches, new_hash); new_hash is None unless the password
+        matches and the stored hash should be replaced
+    """
+    password_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return pwd_context.verify_and_update(password_hash, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -0,0 +1,93 @@
+"""
+Benchmark of the /portfolio/import write path.
+
+Compares the former per-row get-then-save upsert with the batched
+INSERT ... ON CONFLICT upsert, both importing the same positions twice
+(first as inserts, then as updates) for a throwaway user.
+
+Runs against DATABASE_URL (set it to a scratch database; SQLite works).
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:////tmp/bench.db SECRET_KEY=bench python -m benchmarks.bulk_import
+"""
+import time
+import uuid
+from decimal import Decimal
+from database import db, init_database
+from auth.models import User
+from portfolio import crud
+
+
+POSITION_COUNTS = (10, 100, 1000)
+
+
+def make_positions(count: int) -> list[tuple[str, Decimal, Decimal, str]]:
+    """
+    Build synthetic import rows.
+
+    Args:
+        count: Number of positions
+
+    Returns:
+        List of (ticker, quantity, buy_price, color) tuples
+    """
+    return [
+        (f"T{index:05d}.PA", Decimal(index + 1), Decimal("12.3456"), "#1f77b4")
+        for index in range(count)
+    ]
+
+
+def legacy_import(id_user: str, positions: list) -> list:
+    """Former import path: one upsert_position call per row, each in its own transaction."""
+    return [crud.upsert_position(id_user, *position) for position in positions]
+
+
+def bulk_import(id_user: str, positions: list) -> list:
+    """Batched import path."""
+    return crud.bulk_upsert_positions(id_user, positions)
+
+
+def time_import(func, positions: list) -> tuple[float, float]:
+    """
+    Time an import function on a fresh user, for inserts then updates.
+
+    Args:
+        func: Import function taking (id_user, positions)
+        positions: Rows to import
+
+    Returns:
+        Tuple of (insert seconds, update seconds)
+    """
+    name = uuid.uuid4().hex
+    user = User.create(id_user=name, email=f"{name}@bench.local", username=name[:50], hashed_password="x")
+    try:
+        start = time.perf_counter()
+        func(user.id_user, positions)
+        inserted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = func(user.id_user, positions)
+        updated = time.perf_counter() - start
+
+        assert len(result) == len(positions)
+        return inserted, updated
+    finally:
+        user.delete_instance(recursive=True)
+
+
+def main():
+    init_database()
+    with db.connection_context():
+        print(f"{'positions':>9}  {'legacy insert':>13}  {'bulk insert':>11}  {'legacy update':>13}  {'bulk update':>11}")
+        for count in POSITION_COUNTS:
+            positions = make_positions(count)
+            legacy_insert, legacy_update = time_import(legacy_import, positions)
+            bulk_insert, bulk_update = time_import(bulk_import, positions)
+            print(
+                f"{count:>9}  {legacy_insert * 1000:>10.1f} ms  {bulk_insert * 1000:>8.1f} ms"
+                f"  {legacy_update * 1000:>10.1f} ms  {bulk_update * 1000:>8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
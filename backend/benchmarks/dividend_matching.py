@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of dividend-to-price matching in /api/dividends.
+
+Compares the former per-dividend lookup with the vectorized nearest-date join
+on a synthetic 10-year daily price series with quarterly dividends.
+
+Usage (from backend/):
+    python -m benchmarks.dividend_matching
+"""
+import timeit
+import numpy as np
+import pandas as pd
+from market.transforms import closest_prices
+
+
+YEARS = 10
+REPEATS = 20
+
+
+def legacy_closest_price(hist: pd.DataFrame, payment_date: pd.Timestamp) -> float:
+    """Former per-dividend lookup (timezone stripped and searchsorted on every call)."""
+    payment_date_normalized = payment_date.tz_localize(None) if payment_date.tz else payment_date
+    hist_dates = hist.index.tz_localize(None) if hist.index.tz else hist.index
+
+    closest_idx = hist_dates.searchsorted(payment_date_normalized)
+    if closest_idx >= len(hist):
+        closest_idx = len(hist) - 1
+    elif closest_idx > 0:
+        before = hist_dates[closest_idx - 1]
+        after = hist_dates[closest_idx]
+        if abs((payment_date_normalized - before).days) < abs((payment_date_normalized - after).days):
+            closest_idx = closest_idx - 1
+
+    return float(hist['Close'].iloc[closest_idx])
+
+
+def make_data(years: int = YEARS) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Build a synthetic daily price series and quarterly dividends.
+
+    Args:
+        years: Length of the series in years
+
+    Returns:
+        Tuple of (price history, dividends)
+    """
+    rng = np.random.default_rng(42)
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=252 * years, tz="Europe/Paris")
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, len(index))))
+    hist = pd.DataFrame({"Close": close}, index=index)
+
+    dividend_dates = pd.date_range(end=index[-1], periods=4 * years, freq="QS", tz="Europe/Paris")
+    dividends = pd.Series(rng.uniform(0.2, 0.6, len(dividend_dates)), index=dividend_dates)
+    return hist, dividends
+
+
+def main():
+    hist, dividends = make_data()
+
+    legacy = [legacy_closest_price(hist, date) for date in dividends.index]
+    vectorized = closest_prices(hist, dividends.index)
+    assert np.allclose(legacy, vectorized), "Vectorized matching differs from legacy lookup"
+
+    legacy_time = min(timeit.repeat(
+        lambda: [legacy_closest_price(hist, date) for date in dividends.index],
+        number=1, repeat=REPEATS
+    ))
+    vectorized_time = min(timeit.repeat(
+        lambda: closest_prices(hist, dividends.index),
+        number=1, repeat=REPEATS
+    ))
+
+    print(f"{len(hist)} daily bars, {len(dividends)} dividends")
+    print(f"legacy per-dividend lookup: {legacy_time * 1000:8.3f} ms")
+    print(f"vectorized join:            {vectorized_time * 1000:8.3f} ms")
+    print(f"speedup:                    {legacy_time / vectorized_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
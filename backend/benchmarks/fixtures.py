@@ -0,0 +1,148 @@
+"""
+Market data fixtures for the replay provider.
+
+record: download daily history, dividends and info of real tickers from
+yfinance, once, so that benchmarks can replay them offline.
+synthesize: write deterministic random-walk fixtures, for machines that have
+never been online.
+
+Usage (from backend/):
+    python -m benchmarks.fixtures record AI.PA MC.PA TTE.PA --years 10
+    python -m benchmarks.fixtures synthesize --count 20 --out /tmp/fixtures
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import List
+import numpy as np
+import pandas as pd
+from config import settings
+from market.providers import YFinanceProvider
+
+
+HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+# info fields kept in recordings (the full yfinance dictionary is large and volatile)
+INFO_FIELDS = (
+    "longName", "shortName", "currency", "exchange", "quoteType",
+    "exchangeTimezoneName", "dividendYield", "trailingAnnualDividendYield",
+)
+
+
+def write_fixture(directory: Path, ticker: str, history: pd.DataFrame, dividends: pd.Series, info: dict):
+    """
+    Write the fixture files of one ticker.
+
+    Args:
+        directory: Fixture directory
+        ticker: Normalized ticker symbol
+        history: Daily OHLCV bars
+        dividends: Dividend amounts indexed by ex-date
+        info: Company information
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+
+    history = history.reindex(columns=HISTORY_COLUMNS).fillna({"Dividends": 0.0, "Stock Splits": 0.0})
+    history.index = pd.DatetimeIndex(history.index).tz_localize(None).normalize()
+    history.index.name = "Date"
+    history.to_csv(directory / f"{ticker}.history.csv", date_format="%Y-%m-%d")
+
+    dividends = dividends.rename("Dividends")
+    dividends.index = pd.DatetimeIndex(dividends.index).tz_localize(None).normalize()
+    dividends.index.name = "Date"
+    dividends.to_csv(directory / f"{ticker}.dividends.csv", date_format="%Y-%m-%d")
+
+    (directory / f"{ticker}.info.json").write_text(json.dumps(info, indent=2, sort_keys=True))
+
+
+def record(tickers: List[str], directory: Path, years: int):
+    """
+    Record live yfinance data for the given tickers.
+
+    Args:
+        tickers: Ticker symbols (normalized, e.g. "AI.PA")
+        directory: Fixture directory
+        years: Years of daily history to record
+    """
+    provider = YFinanceProvider()
+    for ticker in tickers:
+        history = provider.history(ticker, period=f"{years}y", interval="1d", start=None)
+        if history.empty:
+            print(f"  {ticker}: no data, skipped")
+            continue
+        info = {key: value for key, value in provider.info(ticker).items() if key in INFO_FIELDS}
+        write_fixture(directory, ticker, history, provider.dividends(ticker), info)
+        print(f"  {ticker}: {len(history)} bars")
+
+
+def synthesize(count: int, directory: Path, years: int, seed: int = 42) -> List[str]:
+    """
+    Write deterministic synthetic fixtures (geometric random walks, quarterly dividends).
+
+    Args:
+        count: Number of tickers
+        directory: Fixture directory
+        years: Years of daily history
+        seed: Random seed
+
+    Returns:
+        Synthetic ticker symbols (SYN000.PA, SYN001.PA...)
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.offsets.BDay(1), periods=252 * years)
+    tickers = []
+    for index in range(count):
+        ticker = f"SYN{index:03d}.PA"
+        close = rng.uniform(10, 200) * np.exp(np.cumsum(rng.normal(0.0003, 0.012, len(dates))))
+        history = pd.DataFrame({
+            "Open": close * (1 + rng.normal(0, 0.003, len(dates))),
+            "High": close * (1 + np.abs(rng.normal(0, 0.006, len(dates)))),
+            "Low": close * (1 - np.abs(rng.normal(0, 0.006, len(dates)))),
+            "Close": close,
+            "Volume": rng.integers(10_000, 1_000_000, len(dates)),
+        }, index=dates)
+
+        ex_dates = dates[::63][1:]
+        dividends = pd.Series(np.round(close[::63][1:] * 0.007, 4), index=ex_dates)
+        history["Dividends"] = dividends.reindex(dates, fill_value=0.0)
+
+        info = {"longName": f"Synthetic {index:03d} SA", "shortName": f"SYN {index:03d}", "currency": "EUR", "exchange": "PAR"}
+        write_fixture(directory, ticker, history, dividends, info)
+        tickers.append(ticker)
+    return tickers
+
+
+def recorded_tickers(directory: Path) -> List[str]:
+    """
+    List the tickers that have a recorded history in a fixture directory.
+
+    Args:
+        directory: Fixture directory
+
+    Returns:
+        Sorted ticker symbols
+    """
+    return sorted(path.name[:-len(".history.csv")] for path in directory.glob("*.history.csv"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["record", "synthesize"])
+    parser.add_argument("tickers", nargs="*", help="Tickers to record")
+    parser.add_argument("--out", default=settings.MARKET_FIXTURES_DIR, help="Fixture directory")
+    parser.add_argument("--years", type=int, default=10, help="Years of daily history")
+    parser.add_argument("--count", type=int, default=20, help="Synthetic tickers to write")
+    args = parser.parse_args()
+
+    directory = Path(args.out)
+    if args.command == "record":
+        if not args.tickers:
+            parser.error("record needs at least one ticker")
+        record(args.tickers, directory, args.years)
+    else:
+        tickers = synthesize(args.count, directory, args.years)
+        print(f"Wrote {len(tickers)} synthetic tickers to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Offline load test of the API: throughput and p50/p99 latency per scenario.
+
+Scenarios:
+- quote: GET /api/quote/{ticker}, cycling through the tickers
+- quotes: POST /api/quotes with every ticker
+- historical: POST /api/historical (5y monthly) with every ticker
+- dividends: POST /api/dividends with every ticker
+- login: POST /auth/login (bcrypt bound; see BCRYPT_ROUNDS and PASSWORD_HASH_WORKERS)
+- positions: create, read, update and delete cycles on /portfolio/positions
+
+Each scenario runs at every concurrency level, after a warm-up pass over the
+tickers, so market figures are for warm caches and a synced store.
+
+By default the app runs in-process (through httpx's ASGI transport, client and
+server sharing one event loop) against DATABASE_URL, with market data replayed
+from recorded fixtures (see benchmarks.fixtures). Synthetic fixtures are
+generated when none are recorded. With --base-url, a running server is driven
+instead; start it with MARKET_DATA_PROVIDER=replay to stay offline.
+
+Results can be saved with --json and compared with a previous run with
+--compare, to measure a change across commits.
+
+Needs the development requirements (pip install -r requirements-dev.txt).
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:////tmp/bench.db SECRET_KEY=bench BCRYPT_ROUNDS=4 \\
+        python -m benchmarks.load --concurrency 1,8,32 --latency-ms 50 --json after.json --compare before.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import subprocess
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+import numpy as np
+from config import settings
+from benchmarks.fixtures import recorded_tickers, synthesize
+
+
+SCENARIOS = ("quote", "quotes", "historical", "dividends", "login", "positions")
+PASSWORD = "bench-password"
+
+
+class Session:
+    """Benchmark user and the client acting on its behalf."""
+
+    def __init__(self, client: httpx.AsyncClient, tickers: List[str]):
+        self.client = client
+        self.tickers = tickers
+        self.username = f"bench_{uuid.uuid4().hex[:12]}"
+        self.headers: Dict[str, str] = {}
+        self._counter = itertools.count()
+
+    async def register(self):
+        """Register the benchmark user and keep its access token."""
+        response = await self.client.post("/auth/register", json={
+            "email": f"{self.username}@example.com",
+            "username": self.username,
+            "password": PASSWORD,
+        })
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def quote(self) -> List[httpx.Response]:
+        ticker = self.tickers[next(self._counter) % len(self.tickers)]
+        return [await self.client.get(f"/api/quote/{ticker}")]
+
+    async def quotes(self) -> List[httpx.Response]:
+        return [await self.client.post("/api/quotes", json={"tickers": self.tickers})]
+
+    async def historical(self) -> List[httpx.Response]:
+        return [await self.client.post("/api/historical", json={
+            "tickers": self.tickers, "period": "5y", "interval": "1mo"
+        })]
+
+    async def dividends(self) -> List[httpx.Response]:
+        return [await self.client.post("/api/dividends", json={"tickers": self.tickers})]
+
+    async def login(self) -> List[httpx.Response]:
+        return [await self.client.post("/auth/login", data={"username": self.username, "password": PASSWORD})]
+
+    async def positions(self) -> List[httpx.Response]:
+        ticker = f"CRUD{next(self._counter):06d}.PA"
+        created = await self.client.post("/portfolio/positions", headers=self.headers, json={
+            "ticker": ticker, "quantity": 10, "buyPrice": 42.5, "color": "#1f77b4"
+        })
+        if created.status_code != 201:
+            return [created]
+        url = f"/portfolio/positions/{created.json()['id']}"
+        read = await self.client.get(url, headers=self.headers)
+        updated = await self.client.put(url, headers=self.headers, json={"quantity": 12})
+        deleted = await self.client.delete(url, headers=self.headers)
+        return [created, read, updated, deleted]
+
+
+async def run_level(operation: Callable[[], Awaitable[List[httpx.Response]]], concurrency: int, operations: int) -> dict:
+    """
+    Run operations with a fixed number of concurrent workers.
+
+    Args:
+        operation: Scenario operation (one or more requests)
+        concurrency: Concurrent workers
+        operations: Total operations to run
+
+    Returns:
+        Dictionary with request count, errors, throughput and latency percentiles
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(operations))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            responses = await operation()
+            elapsed = time.perf_counter() - start
+            # Spread the operation's time over its requests
+            latencies.extend([elapsed / len(responses)] * len(responses))
+            errors += sum(1 for response in responses if response.status_code >= 400)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    samples = np.array(latencies) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(samples, 50)), 2),
+        "p99_ms": round(float(np.percentile(samples, 99)), 2),
+    }
+
+
+async def run_suite(client: httpx.AsyncClient, tickers: List[str], scenarios: List[str], levels: List[int], operations: int) -> list:
+    """
+    Run every scenario at every concurrency level.
+
+    Args:
+        client: HTTP client bound to the API
+        tickers: Tickers available from the market data provider
+        scenarios: Scenario names
+        levels: Concurrency levels
+        operations: Operations per scenario and level
+
+    Returns:
+        List of result dictionaries, also printed as they complete
+    """
+    session = Session(client, tickers)
+    await session.register()
+
+    print(f"{'scenario':<12} {'conc':>5} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    results = []
+    for scenario in scenarios:
+        operation = getattr(session, scenario)
+        for _ in tickers:
+            for response in await operation():
+                response.raise_for_status()
+        for level in levels:
+            result = {"scenario": scenario, **await run_level(operation, level, operations)}
+            results.append(result)
+            print(
+                f"{scenario:<12} {level:>5} {result['requests']:>9} {result['errors']:>7} "
+                f"{result['rps']:>9.1f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+            )
+    return results
+
+
+def compare(results: list, baseline_path: Path):
+    """
+    Print throughput and latency changes against a previous run.
+
+    Args:
+        results: Results of this run
+        baseline_path: JSON file written by a previous run with --json
+    """
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit') or 'unknown commit'})")
+    print(f"{'scenario':<12} {'conc':>5} {'req/s':>9} {'p50':>9} {'p99':>9}")
+    for result in results:
+        before = previous.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+        print(
+            f"{result['scenario']:<12} {result['concurrency']:>5} "
+            f"{result['rps'] / before['rps']:>8.2f}x {result['p50_ms'] / before['p50_ms']:>8.2f}x "
+            f"{result['p99_ms'] / before['p99_ms']:>8.2f}x"
+        )
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current commit hash, if running from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_in_process(args, tickers: List[str], fixtures_dir: Path) -> list:
+    """Run the suite against the app in this process, with replayed market data."""
+    from main import app
+    from market import upstream
+    from market.providers import ReplayProvider
+
+    settings.QUOTE_REFRESH_ENABLED = False
+    upstream.set_provider(ReplayProvider(str(fixtures_dir), args.latency_ms / 1000, args.jitter_ms / 1000))
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_suite(client, tickers, args.scenarios, args.concurrency, args.operations)
+
+
+async def run_remote(args, tickers: List[str]) -> list:
+    """Run the suite against a running server."""
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        return await run_suite(client, tickers, args.scenarios, args.concurrency, args.operations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Drive a running server instead of the in-process app")
+    parser.add_argument("--fixtures", default=settings.MARKET_FIXTURES_DIR, help="Recorded market data directory")
+    parser.add_argument("--tickers", type=int, default=10, help="Tickers per market request")
+    parser.add_argument("--latency-ms", type=int, default=settings.MARKET_REPLAY_LATENCY_MS, help="Replayed upstream latency")
+    parser.add_argument("--jitter-ms", type=int, default=settings.MARKET_REPLAY_JITTER_MS, help="Replayed upstream jitter")
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(",")], default=[1, 8, 32])
+    parser.add_argument("--operations", type=int, default=200, help="Operations per scenario and concurrency level")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS))
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--compare", type=Path, help="Compare with results written by a previous run")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    fixtures_dir = Path(args.fixtures)
+    tickers = recorded_tickers(fixtures_dir)
+    if not tickers:
+        if args.base_url:
+            parser.error(f"no fixtures in {fixtures_dir}: record the server's fixtures first (benchmarks.fixtures)")
+        fixtures_dir = Path(tempfile.mkdtemp(prefix="market-fixtures-"))
+        tickers = synthesize(args.tickers, fixtures_dir, years=10)
+        print(f"No fixtures in {args.fixtures}, using {len(tickers)} synthetic tickers ({fixtures_dir})")
+    tickers = tickers[:args.tickers]
+
+    database = "remote" if args.base_url else settings.DATABASE_URL.split(":", 1)[0]
+    latency = "set by the server" if args.base_url else f"{args.latency_ms} ms"
+    print(f"Database: {database}, {len(tickers)} tickers, upstream latency {latency}\n")
+    if args.base_url:
+        results = asyncio.run(run_remote(args, tickers))
+    else:
+        results = asyncio.run(run_in_process(args, tickers, fixtures_dir))
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "commit": _git_commit(),
+            "database": database,
+            "tickers": len(tickers),
+            "latency_ms": args.latency_ms,
+            "results": results,
+        }, indent=2))
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
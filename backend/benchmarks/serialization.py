@@ -0,0 +1,112 @@
+"""
+Benchmark of response serialization for /portfolio/positions and /api/historical.
+
+Positions: the former path (model instances, PositionResponse.model_validate
+per row, then FastAPI's response_model serialization) against the fast path
+(.dicts() rows rendered with orjson). Both include the query, since skipping
+model instances is part of the fast path.
+
+Historical: the former path (jsonable_encoder then json.dumps, as FastAPI does
+for routes without a response model) against FastJSONResponse, on synthetic
+5-year daily series. Compressed sizes are reported too.
+
+Runs against DATABASE_URL (set it to a scratch database; SQLite works).
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:////tmp/bench.db SECRET_KEY=bench python -m benchmarks.serialization
+"""
+import gzip
+import timeit
+import uuid
+from decimal import Decimal
+from typing import List
+import brotli
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from database import db, init_database
+from auth.models import User
+from portfolio import crud
+from portfolio.schemas import PositionResponse
+from serialization import FastJSONResponse
+
+
+POSITION_COUNT = 500
+HISTORICAL_TICKERS = 20
+REPEATS = 20
+
+
+def legacy_positions(id_user: str) -> bytes:
+    """Former listing: model instances validated one by one, then serialized by FastAPI."""
+    positions = [PositionResponse.model_validate(p) for p in crud.get_user_positions(id_user)]
+    return TypeAdapter(List[PositionResponse]).dump_json(positions, by_alias=True)
+
+
+def fast_positions(id_user: str) -> bytes:
+    """Fast listing: API-shaped rows rendered with orjson."""
+    return FastJSONResponse(crud.get_user_position_rows(id_user)).body
+
+
+def make_historical(tickers: int = HISTORICAL_TICKERS) -> list:
+    """
+    Build a synthetic /api/historical payload (5 years of daily closes per ticker).
+
+    Args:
+        tickers: Number of tickers
+
+    Returns:
+        List of per-ticker entries in the rows format
+    """
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=252 * 5).strftime("%Y-%m-%d").tolist()
+    payload = []
+    for index in range(tickers):
+        closes = (50 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, len(dates))))).tolist()
+        payload.append({
+            "ticker": f"T{index}.PA",
+            "historical": [{"Date": date, "Close": close} for date, close in zip(dates, closes)]
+        })
+    return payload
+
+
+def best_time(func) -> float:
+    """Best wall time of func over REPEATS runs, in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=REPEATS)) * 1000
+
+
+def main():
+    init_database()
+    with db.connection_context():
+        name = uuid.uuid4().hex
+        user = User.create(id_user=name, email=f"{name}@bench.local", username=name[:50], hashed_password="x")
+        try:
+            crud.bulk_upsert_positions(user.id_user, [
+                (f"T{index:04d}.PA", Decimal(index + 1), Decimal("12.3456"), "#1f77b4")
+                for index in range(POSITION_COUNT)
+            ])
+            legacy = best_time(lambda: legacy_positions(user.id_user))
+            fast = best_time(lambda: fast_positions(user.id_user))
+            print(f"/portfolio/positions ({POSITION_COUNT} rows, query included)")
+            print(f"  model_validate + response_model: {legacy:8.2f} ms")
+            print(f"  .dicts() + orjson:               {fast:8.2f} ms  ({legacy / fast:.1f}x)")
+        finally:
+            user.delete_instance(recursive=True)
+
+    payload = make_historical()
+    legacy = best_time(lambda: JSONResponse(jsonable_encoder(payload)).body)
+    fast = best_time(lambda: FastJSONResponse(payload).body)
+    body = FastJSONResponse(payload).body
+    print(f"/api/historical ({HISTORICAL_TICKERS} tickers x 5y daily, {len(body) / 1024:.0f} KiB)")
+    print(f"  jsonable_encoder + json.dumps:   {legacy:8.2f} ms")
+    print(f"  orjson:                          {fast:8.2f} ms  ({legacy / fast:.1f}x)")
+    for label, compress in (
+        ("gzip level 6", lambda: gzip.compress(body, compresslevel=6)),
+        ("brotli quality 4", lambda: brotli.compress(body, quality=4)),
+    ):
+        print(f"  {label + ':':<32} {best_time(compress):8.2f} ms  ({len(compress()) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+In-process TTL + LRU cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+# Sentinel returned on cache miss (None is a valid cached value)
+MISSING = object()
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Compare two cached values, treating values that cannot be compared as different."""
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+class _Entry:
+    """Fields cached for one key, with the version of their latest change."""
+
+    __slots__ = ("fields", "version")
+
+    def __init__(self):
+        # Field name -> (value, monotonic expiry, wall-clock storage time)
+        self.fields: Dict[str, Tuple[Any, float, float]] = {}
+        self.version = 0
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a time-to-live per field.
+
+    Each key holds several independently expiring fields, so a quote can keep
+    its company name for hours while its price expires after a minute.
+
+    Every key also carries a version, taken from a cache-wide sequence number
+    whenever one of its fields is set to a different value. Versions never
+    repeat, even after eviction, so they can be used to build ETags. Expired
+    values stay in the cache (until evicted) so that storing the same value
+    again does not change the version, and so that they can be served stale
+    (see lookup).
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Args:
+            max_entries: Maximum number of keys kept before evicting the least recently used
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sequence = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, field: str) -> Any:
+        """
+        Get a cached field value.
+
+        Args:
+            key: Cache key
+            field: Field name within the entry
+
+        Returns:
+            Cached value, or MISSING if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and field in entry.fields:
+                value, expires_at, _ = entry.fields[field]
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return MISSING
+
+    def lookup(self, key: Hashable, field: str) -> Tuple[Any, Optional[float], bool]:
+        """
+        Get a cached field value even if expired, with the time it was stored.
+
+        Counts as a hit only if the value is fresh.
+
+        Args:
+            key: Cache key
+            field: Field name within the entry
+
+        Returns:
+            Tuple of (value, storage time as a Unix timestamp, whether it has
+            expired), or (MISSING, None, True) if absent
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or field not in entry.fields:
+                self.misses += 1
+                return MISSING, None, True
+            value, expires_at, stored_at = entry.fields[field]
+            expired = expires_at <= time.monotonic()
+            if expired:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return value, stored_at, expired
+
+    def set(self, key: Hashable, field: str, value: Any, ttl: float, new_version: bool = False) -> float:
+        """
+        Store a field value.
+
+        Args:
+            key: Cache key
+            field: Field name within the entry
+            value: Value to cache
+            ttl: Time to live in seconds
+            new_version: Change the key's version even if the value is unchanged
+                (for fields whose storage time is part of the responses built from them)
+
+        Returns:
+            Storage time as a Unix timestamp (as reported by lookup)
+        """
+        stored_at = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            if new_version or field not in entry.fields or not _same(entry.fields[field][0], value):
+                self._sequence += 1
+                entry.version = self._sequence
+            entry.fields[field] = (value, time.monotonic() + ttl, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return stored_at
+
+    def version(self, key: Hashable) -> Optional[int]:
+        """
+        Get the version of a key, whether its fields are fresh or not.
+
+        Does not count as a hit or miss, nor refresh the LRU position.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Version of the key, or None if absent
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry.version
+
+    def fresh_version(self, key: Hashable, fields: Iterable[str]) -> Optional[int]:
+        """
+        Get the version of a key if all the given fields are cached and fresh.
+
+        Does not count as a hit or miss, nor refresh the LRU position.
+
+        Args:
+            key: Cache key
+            fields: Field names that must be fresh
+
+        Returns:
+            Version of the key, or None if a field is absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            for field in fields:
+                if field not in entry.fields or entry.fields[field][1] <= now:
+                    return None
+            return entry.version
+
+    def invalidate(self, key: Hashable):
+        """
+        Remove all fields cached for a key.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with size, capacity, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
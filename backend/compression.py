@@ -0,0 +1,117 @@
+"""
+Response compression (brotli or gzip) above a size threshold.
+"""
+from functools import partial
+import anyio.to_thread
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, IdentityResponder, DEFAULT_EXCLUDED_CONTENT_TYPES
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from etag import encoded_etag
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """
+    Parse the content codings accepted by a client.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding header
+
+    Returns:
+        Set of accepted codings (those with q=0 excluded)
+    """
+    encodings = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        params = params.replace(" ", "").lower()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                pass
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+async def _send_with_encoded_etag(send: Send, message: Message):
+    """Suffix the ETag of a compressed response with its content coding."""
+    if message["type"] == "http.response.start":
+        headers = MutableHeaders(raw=message["headers"])
+        encoding = headers.get("content-encoding")
+        if encoding and "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], encoding)
+    await send(message)
+
+
+class BrotliResponder(IdentityResponder):
+    """Compresses response bodies with brotli (whole or streamed)."""
+
+    content_encoding = "br"
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        quality: int,
+        *,
+        thread_minimum_size: int,
+        exclude_content_types: tuple = DEFAULT_EXCLUDED_CONTENT_TYPES
+    ):
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self.quality = quality
+        self.thread_minimum_size = thread_minimum_size
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            # Compressing large bodies inline would block the event loop
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        if more_body:
+            return self._compressor.process(body) + self._compressor.flush()
+        return self._compressor.process(body) + self._compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses of at least minimum_size bytes with brotli or gzip.
+
+    Brotli is used when the client accepts it, gzip otherwise. Compressed
+    responses get their content coding appended to the ETag, so that strong
+    ETags keep identifying a single byte representation.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6, brotli_quality: int = 4):
+        """
+        Args:
+            app: ASGI application
+            minimum_size: Smallest response body (bytes) that gets compressed
+            compresslevel: gzip compression level (1-9)
+            brotli_quality: brotli quality (0-11)
+        """
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        send = partial(_send_with_encoded_etag, send)
+        encodings = _accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        if "br" in encodings:
+            responder = BrotliResponder(
+                self.app,
+                self.minimum_size,
+                self.brotli_quality,
+                thread_minimum_size=self.thread_minimum_size,
+                exclude_content_types=self.exclude_content_types
+            )
+            await responder(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
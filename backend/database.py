@@ -1,27 +1,172 @@
 """
 Database connection and initialization.
 """
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 from peewee import PostgresqlDatabase
 from playhouse.db_url import connect
 from config import settings
+from metrics import observe_db_query
+from timing import record
 
 
-# Create database connection from URL
-db = connect(settings.DATABASE_URL)
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _pooled_url(url: str) -> str:
+    """
+    Switch a database URL to its connection-pooling scheme (e.g. postgresql+pool://).
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Database URL using the pooled backend
+    """
+    scheme, separator, rest = url.partition("://")
+    if "+pool" in scheme:
+        return url
+    return f"{scheme}+pool{separator}{rest}"
+
+
+# Pooled SQLite connections are handed from thread to thread
+_connect_kwargs = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+
+# Create pooled database from URL (connections are checked out lazily, by the
+# worker thread running a query, and released when its task returns, see
+# run_in_db_executor)
+db = connect(
+    _pooled_url(settings.DATABASE_URL),
+    max_connections=settings.DB_MAX_CONNECTIONS,
+    stale_timeout=settings.DB_STALE_TIMEOUT_SECONDS,
+    timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    **_connect_kwargs
+)
+
+
+def _instrument(database):
+    """Time every query executed through a database."""
+    execute_sql = database.execute_sql
+
+    def timed_execute_sql(sql, params=None):
+        start = time.perf_counter()
+        try:
+            return execute_sql(sql, params)
+        finally:
+            seconds = time.perf_counter() - start
+            observe_db_query(sql, seconds)
+            record("db", seconds)
+
+    database.execute_sql = timed_execute_sql
+
+
+_instrument(db)
+
+
+def release_connection():
+    """Return the calling thread's connection to the pool, if it holds one."""
+    if not db.is_closed():
+        db.close()
+
+
+# Worker pool for the database work of request handlers. Peewee connections
+# belong to the thread that opened them: queries made on the event loop would
+# share one connection between all concurrent requests, and a checkout waiting
+# for a free connection would block the loop.
+db_executor = ThreadPoolExecutor(max_workers=settings.DB_MAX_CONNECTIONS, thread_name_prefix="db")
+
+
+def call_and_release(func: Callable, *args) -> Any:
+    """Call func, then return any database connection it opened to the pool."""
+    try:
+        return func(*args)
+    finally:
+        release_connection()
+
+
+async def run_in_db_executor(func: Callable, *args) -> Any:
+    """
+    Run blocking database work in the database worker pool.
+
+    The connection the work checks out is its own (one per worker thread),
+    and is released when it returns. The function runs in a copy of the
+    caller's context, so per-request instrumentation follows it.
+
+    Args:
+        func: Blocking function to run
+        *args: Positional arguments passed to func
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(db_executor, context.run, call_and_release, func, *args)
+
+
+def shutdown_db_executor():
+    """Shut down the database worker pool."""
+    db_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def pool_stats() -> dict:
+    """
+    Get connection pool utilisation.
+
+    Returns:
+        Dictionary with the pool capacity and the number of in-use and idle connections
+    """
+    return {
+        "maxConnections": db._max_connections,
+        "inUse": len(db._in_use),
+        "idle": len(db._connections),
+    }
+
+
+class DatabaseConnectionMiddleware:
+    """
+    ASGI middleware catching database connections opened on the event loop.
+
+    Handlers run their queries through run_in_db_executor (or the market
+    executor), whose worker threads release their connection after every
+    call, so the event loop thread should never hold one. If a query slips
+    onto the loop anyway, its connection, shared with every concurrent
+    request meanwhile, is logged and returned to the pool at the end of the
+    request rather than held forever.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if not db.is_closed():
+                logger.warning(f"Database queried from the event loop during {scope['method']} {scope['path']}")
+                db.close()
 
 
 def init_database():
     """Initialize database connection and create tables."""
     from auth.models import User
     from portfolio.models import Position
+    from market.models import PriceBar, DividendEvent, TickerMetadata
 
-    db.connect(reuse_if_open=True)
-    db.create_tables([User, Position], safe=True)
+    with db.connection_context():
+        db.create_tables([User, Position, PriceBar, DividendEvent, TickerMetadata], safe=True)
     print("✓ Database tables created successfully")
 
 
 def close_database():
-    """Close database connection."""
-    if not db.is_closed():
-        db.close()
-        print("✓ Database connection closed")
+    """Close all pooled database connections."""
+    db.close_all()
+    print("✓ Database connection closed")
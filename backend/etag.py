@@ -0,0 +1,99 @@
+"""
+ETag helpers for conditional GET requests.
+"""
+import hashlib
+from typing import Optional
+from fastapi import Response
+
+
+# Clients must revalidate before reusing a cached response
+CACHE_CONTROL = "private, no-cache"
+
+# Content codings appended to the ETag of compressed responses
+ENCODED_ETAG_CODINGS = ("br", "gzip")
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that determine a response.
+
+    Args:
+        *parts: Values identifying the representation (rendered with repr)
+
+    Returns:
+        Quoted ETag value
+    """
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Derive the ETag of a compressed representation.
+
+    Args:
+        etag: ETag of the uncompressed response
+        encoding: Content coding (e.g. "br")
+
+    Returns:
+        ETag with the coding appended inside the quotes
+    """
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def _base_etag(etag: str) -> str:
+    """Strip the weak prefix and content coding suffix from an ETag."""
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for encoding in ENCODED_ETAG_CODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, per RFC 9110).
+
+    Tags of compressed representations match the ETag they were derived from.
+
+    Args:
+        if_none_match: Value of the If-None-Match header, if any
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (_base_etag(tag.strip()) for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build a 304 Not Modified response.
+
+    Args:
+        etag: Current ETag of the resource
+
+    Returns:
+        Empty 304 response carrying the ETag
+    """
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str):
+    """
+    Attach an ETag and revalidation policy to a response.
+
+    Args:
+        response: Response to annotate
+        etag: ETag of the response body
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
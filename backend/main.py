@@ -7,10 +7,24 @@ from contextlib import asynccontextmanager
 import logging
 
 from config import settings
-from database import init_database, close_database
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware, StatsCollector, register_collector, metrics_response
+from timing import ServerTimingMiddleware
+from serialization import FastJSONResponse
+from database import init_database, close_database, pool_stats, shutdown_db_executor, DatabaseConnectionMiddleware
 from auth.routes import router as auth_router
+from auth.security import password_hasher
+from auth.cache import auth_cache
+from auth.dependencies import is_admin_request
 from portfolio.routes import router as portfolio_router
-from market.routes import router as market_router
+from market.routes import router as market_router, quote_revalidator
+from market.cache import quote_cache, sync_cache
+from market.executor import shutdown_market_executor
+from market.metadata import shutdown_metadata_executor
+from market.upstream import upstream_flight, upstream_limiter
+from market.refresher import quote_refresher
+from projection.routes import router as projection_router
+from projection.montecarlo import shutdown_process_pool
 
 
 # Configure logging
@@ -24,9 +38,19 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize database
     logger.info("Starting up application...")
     init_database()
+    # Startup: Keep quotes of held tickers warm
+    if settings.QUOTE_REFRESH_ENABLED:
+        quote_refresher.start()
     yield
     # Shutdown: Close database connection
     logger.info("Shutting down application...")
+    await quote_refresher.stop()
+    shutdown_market_executor()
+    shutdown_db_executor()
+    shutdown_metadata_executor()
+    quote_revalidator.shutdown()
+    shutdown_process_pool()
+    password_hasher.shutdown()
     close_database()
 
 
@@ -35,7 +59,8 @@ app = FastAPI(
     title="PEA Portfolio Analyzer API",
     description="Portfolio management system with authentication",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -45,12 +70,46 @@ app.add_middleware(
     allow_credentials=True,  # Required for cookies
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # Lets clients send If-None-Match on polled POST endpoints
 )
 
+# Report (and release) database connections opened on the event loop; handlers
+# query through run_in_db_executor
+app.add_middleware(DatabaseConnectionMiddleware)
+
+# Report per-request spans (Server-Timing header, admin ?debug=timing trailer)
+app.add_middleware(
+    ServerTimingMiddleware,
+    enabled=settings.SERVER_TIMING_ENABLED,
+    is_admin=is_admin_request,
+    allowed_origins=", ".join(settings.origins_list)
+)
+
+# Compress large responses (outside the app, so it sees the final body)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY
+)
+
+# Record route latency and database usage (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
+# Expose cache, coalescing, pool and rate limiter counters to Prometheus
+register_collector(StatsCollector(
+    caches={"quote": quote_cache.stats, "sync": sync_cache.stats, "auth": auth_cache.stats},
+    single_flight=upstream_flight.stats,
+    password_hasher=password_hasher.stats,
+    db_pool=pool_stats,
+    upstream_limiter=upstream_limiter.stats
+))
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(portfolio_router)
 app.include_router(market_router)
+app.include_router(projection_router)
 
 
 @app.get("/")
@@ -66,7 +125,13 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "database": pool_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return metrics_response()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+"""
+In-process caches for market data.
+"""
+from cache import TTLCache, MISSING
+from config import settings
+
+
+# Quote cache keyed by normalized ticker (fields: price, name, dividendYield)
+quote_cache = TTLCache(max_entries=settings.QUOTE_CACHE_MAX_ENTRIES)
+
+# Recent store syncs (one field per dataset, holding the latest stored point),
+# used to throttle upstream refreshes and to version stored market data
+sync_cache = TTLCache(max_entries=settings.QUOTE_CACHE_MAX_ENTRIES)
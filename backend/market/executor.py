@@ -0,0 +1,55 @@
+"""
+Bounded worker pool for blocking market data work (yfinance, pandas, database).
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+from config import settings
+from database import call_and_release
+
+
+# Bounded worker pool for blocking yfinance calls
+market_executor = ThreadPoolExecutor(
+    max_workers=settings.MARKET_MAX_WORKERS,
+    thread_name_prefix="market"
+)
+
+
+async def run_in_executor(func: Callable, *args) -> Any:
+    """
+    Run a blocking function in the market worker pool.
+
+    Database connections opened by the function are released when it returns,
+    so idle workers do not hold pooled connections. The function runs in a
+    copy of the caller's context, so per-request instrumentation follows it.
+
+    Args:
+        func: Blocking function to run
+        *args: Positional arguments passed to func
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(market_executor, context.run, call_and_release, func, *args)
+
+
+async def gather_per_ticker(func: Callable[[str], Any], tickers: List[str]) -> List[Any]:
+    """
+    Run a per-ticker function for every ticker concurrently, preserving input order.
+
+    Args:
+        func: Blocking function taking a ticker and returning its result entry
+        tickers: List of ticker symbols
+
+    Returns:
+        List of results in the same order as tickers
+    """
+    return list(await asyncio.gather(*(run_in_executor(func, ticker) for ticker in tickers)))
+
+
+def shutdown_market_executor():
+    """Shut down the market worker pool."""
+    market_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,148 @@
+"""
+Persistent ticker metadata (name, currency, exchange), refreshed in the background.
+
+Company information is one of the slowest and most rate-limited upstream
+calls, so it is never fetched on a request path: reads only hit the
+ticker_metadata table, and tickers seen for the first time, or whose row is
+older than TICKER_METADATA_TTL_SECONDS, are refreshed by a background worker.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List
+from cache import TTLCache, MISSING
+from config import settings
+from database import release_connection
+from market.cache import quote_cache
+from market.models import TickerMetadata
+from market.ratelimit import BACKGROUND, upstream_lane
+from market import upstream
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay before retrying a ticker whose refresh failed (seconds)
+RETRY_DELAY_SECONDS = 5 * 60
+
+# Single worker: refreshes are rare and should not compete with interactive fetches
+_metadata_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata")
+
+# Tickers queued or being refreshed
+_pending = set()
+_pending_lock = threading.Lock()
+
+# Tickers whose last refresh failed, until they may be retried
+_failures = TTLCache(max_entries=settings.QUOTE_CACHE_MAX_ENTRIES)
+
+
+def get_metadata(symbols: List[str]) -> Dict[str, dict]:
+    """
+    Get the stored metadata of several tickers in one query.
+
+    Tickers without metadata, or with metadata older than
+    TICKER_METADATA_TTL_SECONDS, are scheduled for a background refresh;
+    this never waits on the upstream.
+
+    Args:
+        symbols: Normalized ticker symbols
+
+    Returns:
+        Dictionary with name, currency, exchange and refreshedAt by symbol
+        (symbols never refreshed are absent)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    rows = {
+        row.pop("symbol"): row
+        for row in (TickerMetadata
+                    .select(
+                        TickerMetadata.symbol,
+                        TickerMetadata.name,
+                        TickerMetadata.currency,
+                        TickerMetadata.exchange,
+                        TickerMetadata.refreshed_at.alias("refreshedAt")
+                    )
+                    .where(TickerMetadata.symbol.in_(symbols))
+                    .dicts())
+    }
+
+    stale_before = datetime.now() - timedelta(seconds=settings.TICKER_METADATA_TTL_SECONDS)
+    schedule_refresh([
+        symbol for symbol in symbols
+        if symbol not in rows or rows[symbol]["refreshedAt"] < stale_before
+    ])
+    return rows
+
+
+def refresh_metadata(symbol: str) -> dict:
+    """
+    Fetch and store the metadata of a ticker (blocking).
+
+    Args:
+        symbol: Normalized ticker symbol
+
+    Returns:
+        Stored row (name, currency and exchange may be None)
+    """
+    info = upstream.fetch_info(symbol)
+    row = {
+        "symbol": symbol,
+        "name": info.get('longName') or info.get('shortName'),
+        "currency": info.get('currency'),
+        "exchange": info.get('exchange'),
+        "refreshed_at": datetime.now(),
+    }
+    (TickerMetadata
+     .insert(**row)
+     .on_conflict(
+         conflict_target=[TickerMetadata.symbol],
+         preserve=[TickerMetadata.name, TickerMetadata.currency, TickerMetadata.exchange, TickerMetadata.refreshed_at]
+     )
+     .execute())
+
+    if row["name"]:
+        quote_cache.set(symbol, "name", row["name"], settings.QUOTE_INFO_TTL_SECONDS)
+    return row
+
+
+def _refresh_in_background(symbol: str):
+    """Refresh the metadata of a ticker from the background worker."""
+    try:
+        with upstream_lane(BACKGROUND):
+            refresh_metadata(symbol)
+    except Exception as e:
+        logger.warning(f"Metadata refresh failed for {symbol}: {str(e)}")
+        _failures.set(symbol, "failed", True, RETRY_DELAY_SECONDS)
+    finally:
+        release_connection()
+        with _pending_lock:
+            _pending.discard(symbol)
+
+
+def schedule_refresh(symbols: List[str]):
+    """
+    Queue background metadata refreshes.
+
+    Tickers already queued, or whose refresh failed less than
+    RETRY_DELAY_SECONDS ago, are skipped.
+
+    Args:
+        symbols: Normalized ticker symbols
+    """
+    with _pending_lock:
+        queued = [
+            symbol for symbol in symbols
+            if symbol not in _pending and _failures.get(symbol, "failed") is MISSING
+        ]
+        _pending.update(queued)
+    for symbol in queued:
+        _metadata_executor.submit(_refresh_in_background, symbol)
+
+
+def shutdown_metadata_executor():
+    """Shut down the background metadata worker."""
+    _metadata_executor.shutdown(wait=False, cancel_futures=True)
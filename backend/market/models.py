@@ -0,0 +1,67 @@
+"""
+Market data models.
+"""
+from peewee import (
+    Model,
+    CharField,
+    DateField,
+    DateTimeField,
+    DoubleField,
+    BigIntegerField,
+    CompositeKey,
+)
+from database import db
+
+
+class PriceBar(Model):
+    """Historical OHLCV price bar for a ticker at a given interval."""
+
+    ticker = CharField(max_length=20)  # Normalized ticker (with exchange suffix)
+    interval = CharField(max_length=5)  # yfinance interval, e.g. "1d" or "1mo"
+    date = DateField()
+    open = DoubleField(null=True)
+    high = DoubleField(null=True)
+    low = DoubleField(null=True)
+    close = DoubleField()
+    volume = BigIntegerField(null=True)
+
+    class Meta:
+        database = db
+        table_name = 'price_bars'
+        primary_key = CompositeKey('ticker', 'interval', 'date')
+
+    def __repr__(self):
+        return f"<PriceBar {self.ticker} {self.interval} {self.date} close={self.close}>"
+
+
+class DividendEvent(Model):
+    """Dividend paid by a ticker, keyed by ex-dividend date."""
+
+    ticker = CharField(max_length=20)  # Normalized ticker (with exchange suffix)
+    ex_date = DateField()
+    amount = DoubleField()
+
+    class Meta:
+        database = db
+        table_name = 'dividend_events'
+        primary_key = CompositeKey('ticker', 'ex_date')
+
+    def __repr__(self):
+        return f"<DividendEvent {self.ticker} {self.ex_date} amount={self.amount}>"
+
+
+class TickerMetadata(Model):
+    """Descriptive information about a ticker, refreshed in the background."""
+
+    symbol = CharField(max_length=20, primary_key=True)  # Normalized ticker (with exchange suffix)
+    name = CharField(max_length=255, null=True)
+    currency = CharField(max_length=10, null=True)
+    exchange = CharField(max_length=20, null=True)
+    refreshed_at = DateTimeField()
+
+    class Meta:
+        database = db
+        table_name = 'ticker_metadata'
+
+    def __repr__(self):
+        return f"<TickerMetadata {self.symbol} {self.name}>"
@@ -0,0 +1,357 @@
+"""
+Market data providers: live yfinance and a fixture-backed replay stand-in.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Provider names accepted by MARKET_DATA_PROVIDER
+YFINANCE_PROVIDER = "yfinance"
+REPLAY_PROVIDER = "replay"
+
+# Error text of HTTP 429 responses, as reported by yfinance
+THROTTLED_MESSAGE = "Too Many Requests"
+
+# Pandas resampling rules of the intervals the replay provider can serve
+REPLAY_INTERVALS = {"1d": None, "1wk": "W-MON", "1mo": "MS"}
+
+# OHLCV aggregation used when resampling daily bars
+_OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+    "Dividends": "sum",
+    "Stock Splits": "sum",
+}
+
+
+class MarketDataProvider:
+    """
+    Source of price history, company information and dividends.
+
+    Implementations follow yfinance's conventions: unknown tickers yield an
+    empty frame, series or dictionary rather than an error.
+    """
+
+    name = "base"
+
+    def history(self, ticker: str, period: Optional[str], interval: str, start: Optional[str]) -> pd.DataFrame:
+        """
+        Get price history.
+
+        Args:
+            ticker: Normalized ticker symbol
+            period: yfinance period (ignored when start is given)
+            interval: yfinance interval
+            start: First date to return (ISO format)
+
+        Returns:
+            OHLCV DataFrame indexed by bar datetime
+        """
+        raise NotImplementedError
+
+    def download(
+        self,
+        tickers: List[str],
+        period: Optional[str],
+        interval: str,
+        start: Optional[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get the price history of several tickers in one call.
+
+        Args:
+            tickers: Normalized ticker symbols
+            period: yfinance period (ignored when start is given)
+            interval: yfinance interval
+            start: First date to return (ISO format)
+
+        Returns:
+            OHLCV DataFrame per ticker (empty for tickers without data)
+        """
+        return {ticker: self.history(ticker, period, interval, start) for ticker in tickers}
+
+    def is_throttled(self, error: Exception) -> bool:
+        """
+        Tell whether an error means the provider is rate limiting us.
+
+        Args:
+            error: Error raised by a provider call
+
+        Returns:
+            True for throttling errors (the call may be retried after a delay)
+        """
+        return False
+
+    def info(self, ticker: str) -> dict:
+        """
+        Get company information.
+
+        Args:
+            ticker: Normalized ticker symbol
+
+        Returns:
+            yfinance-style info dictionary (longName, shortName, currency...)
+        """
+        raise NotImplementedError
+
+    def dividends(self, ticker: str) -> pd.Series:
+        """
+        Get the full dividend history.
+
+        Args:
+            ticker: Normalized ticker symbol
+
+        Returns:
+            Series of dividend amounts indexed by ex-date
+        """
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live market data from the yfinance API."""
+
+    name = YFINANCE_PROVIDER
+
+    def history(self, ticker: str, period: Optional[str], interval: str, start: Optional[str]) -> pd.DataFrame:
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start, interval=interval)
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+    def download(
+        self,
+        tickers: List[str],
+        period: Optional[str],
+        interval: str,
+        start: Optional[str]
+    ) -> Dict[str, pd.DataFrame]:
+        window = {"start": start} if start is not None else {"period": period}
+        # Same adjustments and columns as Ticker.history
+        frame = yf.download(
+            tickers,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            actions=True,
+            multi_level_index=True,
+            progress=False,
+            **window
+        )
+        return split_download(frame, tickers)
+
+    def is_throttled(self, error: Exception) -> bool:
+        return isinstance(error, YFRateLimitError) or THROTTLED_MESSAGE in str(error)
+
+    def info(self, ticker: str) -> dict:
+        return yf.Ticker(ticker).info
+
+    def dividends(self, ticker: str) -> pd.Series:
+        return yf.Ticker(ticker).dividends
+
+
+def split_download(frame: Optional[pd.DataFrame], tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split a multi-ticker yfinance download into one frame per ticker.
+
+    The download aligns every ticker on the union of their dates, so rows
+    without a close (other markets' trading days) are dropped. Tickers
+    yfinance failed to download get an empty frame, as Ticker.history
+    returns for unknown tickers.
+
+    Args:
+        frame: Download grouped by ticker (columns: ticker, field)
+        tickers: Requested ticker symbols
+
+    Returns:
+        OHLCV DataFrame per ticker
+    """
+    downloaded = set(frame.columns.get_level_values(0)) if frame is not None and not frame.empty else set()
+    histories = {}
+    for ticker in tickers:
+        if ticker in downloaded:
+            histories[ticker] = frame[ticker].dropna(subset=["Close"])
+        else:
+            histories[ticker] = pd.DataFrame(columns=list(_OHLCV_AGGREGATION))
+    return histories
+
+
+def _period_offset(period: str) -> pd.DateOffset:
+    """Convert a yfinance period string (e.g. "5d", "6mo", "10y") to a date offset."""
+    if period.endswith("mo"):
+        return pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("y"):
+        return pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("wk"):
+        return pd.DateOffset(weeks=int(period[:-2]))
+    if period.endswith("d"):
+        # Trading days, as yfinance counts them
+        return pd.offsets.BDay(int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Replays recorded market data from local files, with artificial latency.
+
+    The fixture directory holds, per ticker, <TICKER>.history.csv (daily OHLCV
+    bars, dated in exchange local time without timezone), <TICKER>.dividends.csv
+    and <TICKER>.info.json, as written by benchmarks.fixtures. Weekly and
+    monthly intervals are resampled from the daily bars. Recordings are
+    shifted forward so that their last bar falls on the last business day
+    before today, keeping period-relative requests ("5d", "5y") meaningful
+    however old the recording is.
+    """
+
+    name = REPLAY_PROVIDER
+
+    def __init__(
+        self,
+        fixtures_dir: str,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        shift_to_today: bool = True
+    ):
+        """
+        Args:
+            fixtures_dir: Directory of recorded fixtures
+            latency_seconds: Delay added to every call
+            jitter_seconds: Maximum random delay added on top of latency_seconds
+            shift_to_today: Move recorded dates so the last bar is the last business day
+        """
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.shift_to_today = shift_to_today
+        self._recordings: Dict[str, Tuple[pd.DataFrame, pd.Series, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        """Simulate the upstream round trip."""
+        delay = self.latency_seconds
+        if self.jitter_seconds:
+            delay += random.uniform(0, self.jitter_seconds)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _load(self, ticker: str) -> Tuple[pd.DataFrame, pd.Series, dict]:
+        """
+        Load (once) the recording of a ticker.
+
+        Args:
+            ticker: Normalized ticker symbol
+
+        Returns:
+            Tuple of (daily bars, dividends, info); empty when nothing was recorded
+        """
+        with self._lock:
+            recording = self._recordings.get(ticker)
+        if recording is not None:
+            return recording
+
+        history_path = self.fixtures_dir / f"{ticker}.history.csv"
+        dividends_path = self.fixtures_dir / f"{ticker}.dividends.csv"
+        info_path = self.fixtures_dir / f"{ticker}.info.json"
+
+        bars = pd.DataFrame(columns=list(_OHLCV_AGGREGATION), index=pd.DatetimeIndex([], name="Date"))
+        if history_path.exists():
+            bars = pd.read_csv(history_path, index_col="Date", parse_dates=["Date"])
+        dividends = pd.Series(dtype=float, name="Dividends", index=pd.DatetimeIndex([], name="Date"))
+        if dividends_path.exists():
+            dividends = pd.read_csv(dividends_path, index_col="Date", parse_dates=["Date"])["Dividends"]
+        info = json.loads(info_path.read_text()) if info_path.exists() else {}
+
+        if self.shift_to_today and not bars.empty:
+            last_business_day = pd.Timestamp(date.today()) - pd.offsets.BDay(1)
+            shift_days = len(pd.bdate_range(bars.index[-1], last_business_day)) - 1
+            if shift_days > 0:
+                bars.index = bars.index + pd.offsets.BDay(shift_days)
+                dividends.index = dividends.index + pd.offsets.BDay(shift_days)
+
+        recording = (bars, dividends, info)
+        with self._lock:
+            self._recordings[ticker] = recording
+        return recording
+
+    def _select(self, ticker: str, period: Optional[str], interval: str, start: Optional[str]) -> pd.DataFrame:
+        """Select the recorded bars of a history request."""
+        bars, _, _ = self._load(ticker)
+        if bars.empty:
+            return bars.copy()
+
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start)]
+        elif period and period != "max":
+            bars = bars[bars.index > bars.index[-1] - _period_offset(period)]
+
+        if interval not in REPLAY_INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        rule = REPLAY_INTERVALS[interval]
+        if rule is not None and not bars.empty:
+            bars = bars.resample(rule).agg(_OHLCV_AGGREGATION).dropna(subset=["Close"])
+        return bars.copy()
+
+    def history(self, ticker: str, period: Optional[str], interval: str, start: Optional[str]) -> pd.DataFrame:
+        self._sleep()
+        return self._select(ticker, period, interval, start)
+
+    def download(
+        self,
+        tickers: List[str],
+        period: Optional[str],
+        interval: str,
+        start: Optional[str]
+    ) -> Dict[str, pd.DataFrame]:
+        # One simulated round trip for the whole batch
+        self._sleep()
+        return {ticker: self._select(ticker, period, interval, start) for ticker in tickers}
+
+    def info(self, ticker: str) -> dict:
+        self._sleep()
+        return dict(self._load(ticker)[2])
+
+    def dividends(self, ticker: str) -> pd.Series:
+        self._sleep()
+        return self._load(ticker)[1].copy()
+
+
+def create_provider(
+    name: str,
+    fixtures_dir: str = "",
+    latency_seconds: float = 0.0,
+    jitter_seconds: float = 0.0
+) -> MarketDataProvider:
+    """
+    Create a market data provider by name.
+
+    Args:
+        name: Provider name ("yfinance" or "replay")
+        fixtures_dir: Fixture directory of the replay provider
+        latency_seconds: Artificial latency of the replay provider
+        jitter_seconds: Artificial latency jitter of the replay provider
+
+    Returns:
+        Provider instance
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    if name == YFINANCE_PROVIDER:
+        return YFinanceProvider()
+    if name == REPLAY_PROVIDER:
+        logger.info(f"Replaying market data from {fixtures_dir} ({latency_seconds * 1000:.0f} ms latency)")
+        return ReplayProvider(fixtures_dir, latency_seconds, jitter_seconds)
+    raise ValueError(f"Unknown market data provider: {name}")
@@ -0,0 +1,171 @@
+"""
+Shared rate limiting of upstream market data calls.
+
+A token bucket caps the rate of calls to the provider, serving interactive
+requests before background work (quote refresher, metadata refreshes). When
+the provider throttles anyway, the whole bucket pauses for an exponentially
+growing, jittered delay before the call is retried.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+# Priority lanes (interactive requests go first)
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+LANES = (INTERACTIVE, BACKGROUND)
+
+_lane: ContextVar[str] = ContextVar("upstream_lane", default=INTERACTIVE)
+
+
+class UpstreamThrottled(Exception):
+    """The market data provider is rate limiting us, or our own limiter is saturated."""
+
+    def __init__(self, retry_after: float):
+        """
+        Args:
+            retry_after: Suggested delay before retrying, in seconds
+        """
+        super().__init__("Market data provider is rate limiting requests, retry later")
+        self.retry_after = retry_after
+
+
+def current_lane() -> str:
+    """Get the priority lane of upstream calls made from the current context."""
+    return _lane.get()
+
+
+@contextmanager
+def upstream_lane(lane: str) -> Iterator[None]:
+    """
+    Run upstream calls made in a block in a priority lane.
+
+    The lane follows the context into the market executor.
+
+    Args:
+        lane: INTERACTIVE or BACKGROUND
+    """
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Delay before retrying a throttled call (exponential backoff with jitter).
+
+    Args:
+        attempt: Number of throttled attempts so far, minus one
+        base: Delay after the first throttled attempt, in seconds
+        cap: Maximum delay, in seconds
+
+    Returns:
+        Delay in seconds, between half and all of min(cap, base * 2 ** attempt)
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+
+class PriorityRateLimiter:
+    """
+    Token bucket shared by every thread calling the upstream, with priority lanes.
+
+    Tokens refill continuously at `rate` per second, up to `burst`. A
+    background call only takes a token when no interactive call is waiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: Sustained calls per second
+            burst: Bucket capacity (calls allowed at once after a quiet period)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting: Dict[str, int] = {lane: 0 for lane in LANES}
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update, none during a pause (lock held)."""
+        elapsed = max(now - max(self._updated, self._paused_until), 0.0)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, lane: str = INTERACTIVE, cost: int = 1, timeout: Optional[float] = None) -> float:
+        """
+        Take tokens for a call, waiting for them if needed.
+
+        Args:
+            lane: Priority lane of the call
+            cost: Tokens taken (capped at the bucket capacity)
+            timeout: Maximum wait in seconds (None to wait indefinitely)
+
+        Returns:
+            Time spent waiting, in seconds
+
+        Raises:
+            UpstreamThrottled: If the tokens are not available within the timeout
+        """
+        cost = min(cost, self.burst)
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        with self._condition:
+            self._waiting[lane] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    yields = lane == BACKGROUND and self._waiting[INTERACTIVE] > 0
+                    if not yields and now >= self._paused_until and self._tokens >= cost:
+                        self._tokens -= cost
+                        return now - start
+
+                    wait = max(self._paused_until - now, (cost - self._tokens) / self.rate, 0.001)
+                    if deadline is not None:
+                        # Fail fast when a pause outlasts the timeout
+                        if now >= deadline or self._paused_until > deadline:
+                            raise UpstreamThrottled(retry_after=max(wait, 1.0))
+                        wait = min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                self._waiting[lane] -= 1
+                # Background calls may have been yielding to this one
+                self._condition.notify_all()
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for a while (after the provider throttled a call).
+
+        Args:
+            seconds: Pause duration
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._condition.notify_all()
+
+    def stats(self) -> dict:
+        """
+        Get limiter state.
+
+        Returns:
+            Dictionary with available tokens, waiting calls per lane and remaining pause
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "tokens": self._tokens,
+                "waiting": dict(self._waiting),
+                "pausedSeconds": max(self._paused_until - now, 0.0),
+            }
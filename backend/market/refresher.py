@@ -0,0 +1,125 @@
+"""
+Background refresh of quotes for every ticker held in a portfolio.
+"""
+import asyncio
+import logging
+from functools import partial
+from typing import Dict, List, Optional
+import pandas as pd
+from config import settings
+from market.executor import run_in_executor, gather_per_ticker
+from market.ratelimit import BACKGROUND, upstream_lane
+from market.routes import fetch_quote, normalize_ticker, prefetch_quote_histories
+from portfolio.models import Position
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def get_held_tickers() -> List[str]:
+    """
+    Get the distinct normalized tickers across all positions.
+
+    Returns:
+        Sorted list of normalized ticker symbols
+    """
+    tickers = Position.select(Position.ticker).distinct().tuples()
+    return sorted({normalize_ticker(ticker) for (ticker,) in tickers})
+
+
+def _refresh_quote(ticker: str, histories: Dict[str, pd.DataFrame]) -> bool:
+    """
+    Refresh the cached quote of one ticker.
+
+    Args:
+        ticker: Normalized ticker symbol
+        histories: Recent price histories downloaded for the tick
+
+    Returns:
+        True if a price was fetched
+    """
+    try:
+        return fetch_quote(ticker, refresh_price=True, hist=histories.get(ticker)) is not None
+    except Exception as e:
+        logger.warning(f"Background refresh failed for {ticker}: {str(e)}")
+        return False
+
+
+class QuoteRefresher:
+    """
+    Periodically refreshes the quote cache for all held tickers.
+
+    Each tick refreshes at most QUOTE_REFRESH_MAX_TICKERS tickers, rotating
+    through the held tickers so every one is refreshed over successive ticks.
+    Their prices are downloaded with batched multi-ticker downloads.
+    """
+
+    def __init__(self, interval: float, max_tickers: int):
+        """
+        Args:
+            interval: Delay between ticks in seconds
+            max_tickers: Maximum number of tickers refreshed per tick
+        """
+        self.interval = interval
+        self.max_tickers = max_tickers
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def tick(self) -> int:
+        """
+        Refresh the next batch of held tickers.
+
+        Returns:
+            Number of tickers successfully refreshed
+        """
+        tickers = await run_in_executor(get_held_tickers)
+        if not tickers:
+            return 0
+
+        if len(tickers) > self.max_tickers:
+            start = self._cursor % len(tickers)
+            batch = (tickers[start:] + tickers[:start])[:self.max_tickers]
+            self._cursor = start + self.max_tickers
+        else:
+            batch = tickers
+
+        # Refreshes give way to interactive requests at the upstream rate limiter
+        with upstream_lane(BACKGROUND):
+            histories = await run_in_executor(prefetch_quote_histories, batch, True)
+            results = await gather_per_ticker(partial(_refresh_quote, histories=histories), batch)
+        return sum(results)
+
+    async def _run(self):
+        """Refresh loop, running until cancelled."""
+        while True:
+            try:
+                refreshed = await self.tick()
+                logger.debug(f"Refreshed {refreshed} quotes")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Quote refresher tick failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the refresh loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared refresher started from the application lifespan
+quote_refresher = QuoteRefresher(
+    interval=settings.QUOTE_REFRESH_INTERVAL_SECONDS,
+    max_tickers=settings.QUOTE_REFRESH_MAX_TICKERS
+)
@@ -0,0 +1,92 @@
+"""
+Background revalidation of market data served stale.
+
+When a cached value has expired but is still young enough to be served, the
+request answers with it right away and schedules a revalidation here instead
+of waiting on the upstream. Keys scheduled while a revalidation is queued or
+running are coalesced, and refreshed together in the next batch, in the
+background rate limiting lane.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List
+from cache import TTLCache, MISSING
+from config import settings
+from database import release_connection
+from market.ratelimit import BACKGROUND, upstream_lane
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class Revalidator:
+    """
+    Single background worker refreshing batches of keys.
+
+    Keys whose refresh failed are not rescheduled for retry_delay seconds, so
+    that an upstream incident does not turn every stale read into a retry.
+    """
+
+    def __init__(self, name: str, refresh: Callable[[List[str]], Iterable[str]], retry_delay: float):
+        """
+        Args:
+            name: Worker thread name prefix
+            refresh: Blocking function refreshing a batch of keys, returning
+                the keys it could not refresh
+            retry_delay: Delay before a failed key may be scheduled again, in seconds
+        """
+        self.refresh = refresh
+        self.retry_delay = retry_delay
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        # Keys waiting for the worker, and keys queued or being refreshed
+        self._queued: List[str] = []
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._failures = TTLCache(max_entries=settings.QUOTE_CACHE_MAX_ENTRIES)
+
+    def schedule(self, keys: Iterable[str]):
+        """
+        Queue keys for a background refresh.
+
+        Keys already queued or being refreshed, or whose refresh failed less
+        than retry_delay seconds ago, are skipped.
+
+        Args:
+            keys: Keys to refresh
+        """
+        with self._lock:
+            due = [
+                key for key in dict.fromkeys(keys)
+                if key not in self._pending and self._failures.get(key, "failed") is MISSING
+            ]
+            if not due:
+                return
+            # A batch is already submitted if the queue is not empty
+            submit = not self._queued
+            self._queued.extend(due)
+            self._pending.update(due)
+        if submit:
+            self._executor.submit(self._run)
+
+    def _run(self):
+        """Refresh every queued key (worker thread)."""
+        with self._lock:
+            batch, self._queued = self._queued, []
+        failed: Iterable[str] = batch
+        try:
+            with upstream_lane(BACKGROUND):
+                failed = list(self.refresh(batch))
+        except Exception as e:
+            logger.warning(f"Revalidation of {len(batch)} keys failed: {str(e)}")
+        finally:
+            release_connection()
+            for key in failed:
+                self._failures.set(key, "failed", True, self.retry_delay)
+            with self._lock:
+                self._pending.difference_update(batch)
+
+    def shutdown(self):
+        """Shut down the background worker."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
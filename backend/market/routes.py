@@ -1,11 +1,31 @@
 """
-Market data API routes (stock quotes, dividends, historical data).
+Market data API routes (stock quotes, dividends, historical data, dashboard).
 """
-from fastapi import APIRouter, HTTPException
-import yfinance as yf
+import math
+import time
+from datetime import date, datetime, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException
+import numpy as np
 import pandas as pd
 import logging
-from market.schemas import TickerRequest
+from config import settings
+from auth.models import User
+from auth.dependencies import get_current_user
+from cache import TTLCache
+from etag import make_etag, etag_matches, not_modified, set_etag
+from metrics import InstrumentedRoute, count_stale_served
+from serialization import FastJSONResponse
+from timing import span
+from market.cache import quote_cache, sync_cache, MISSING
+from market.executor import run_in_executor, gather_per_ticker
+from market.ratelimit import UpstreamThrottled
+from market.revalidation import Revalidator
+from market.schemas import TickerRequest, HistoricalRequest
+from market.transforms import closest_prices, downsample
+from market import metadata, store, upstream
+from portfolio import crud
 
 
 # Configure logging
@@ -19,7 +39,10 @@ TEN_YEAR_PERIOD = "10y"
 MONTHLY_INTERVAL = "1mo"
 DAILY_INTERVAL = "1d"
 
-router = APIRouter(prefix="/api", tags=["Market Data"])
+# Quote cache fields making up a quote
+QUOTE_FIELDS = ("price", "name", "dividendYield")
+
+router = APIRouter(prefix="/api", tags=["Market Data"], route_class=InstrumentedRoute)
 
 
 def normalize_ticker(ticker: str) -> str:
@@ -38,24 +61,19 @@ def normalize_ticker(ticker: str) -> str:
     return f"{ticker}{BELGIAN_EXCHANGE_SUFFIX}"
 
 
-def calculate_avg_dividend_yield(stock: yf.Ticker, current_price: float) -> float:
+def calculate_avg_dividend_yield(ticker: str, current_price: float) -> float:
     """
     Calculate the average dividend yield over the last 5 years based on current price.
 
     Args:
-        stock: yfinance Ticker object
+        ticker: Normalized ticker symbol
         current_price: Current stock price
 
     Returns:
         Average dividend yield as a percentage
     """
     try:
-        dividends = stock.dividends
-        if dividends.empty:
-            return 0.0
-
-        five_years_ago = pd.Timestamp.now(tz=dividends.index.tz) - pd.DateOffset(years=5)
-        recent_dividends = dividends[dividends.index >= five_years_ago]
+        recent_dividends = store.get_dividends(ticker, store.period_start(FIVE_YEAR_PERIOD))
 
         if recent_dividends.empty:
             return 0.0
@@ -69,266 +87,762 @@ def calculate_avg_dividend_yield(stock: yf.Ticker, current_price: float) -> floa
         return 0.0
 
 
-@router.get("/quote/{ticker}")
-async def get_quote(ticker: str):
+def fetch_quote(ticker: str, refresh_price: bool = False, hist: Optional[pd.DataFrame] = None) -> Optional[dict]:
     """
-    Get current quote information for a single ticker.
+    Fetch current quote information for a single ticker (blocking).
+
+    Each field is served from the quote cache when fresh; only missing or
+    expired fields are fetched from yfinance. An expired price younger than
+    QUOTE_STALE_MAX_SECONDS is served stale while it is revalidated in the
+    background.
 
     Args:
         ticker: Stock ticker symbol
+        refresh_price: Fetch the price even if a cached one is fresh
+        hist: Recent price history already downloaded for the ticker (see
+            prefetch_quote_histories), used instead of fetching it
 
     Returns:
-        Quote information including current price, dividend yield, and company name
+        Quote information, or None if no price data is available
+    """
+    normalized_ticker = normalize_ticker(ticker)
 
-    Raises:
-        HTTPException: If ticker is not found or data cannot be retrieved
+    cached = None if refresh_price else _cached_price(normalized_ticker)
+    if cached is not None:
+        return _quote(ticker, *cached)
+
+    if hist is None:
+        hist = upstream.fetch_history(normalized_ticker, period=DEFAULT_HISTORY_PERIOD)
+
+    if hist.empty:
+        return None
+
+    return _quote(ticker, *_cache_price(normalized_ticker, float(hist['Close'].iloc[-1])))
+
+
+def _cache_price(ticker: str, price: float) -> Tuple[float, float, bool]:
+    """
+    Cache a freshly fetched price.
+
+    The quote gets a new cache version even if the price did not change,
+    since its fetch time (asOf) is part of quote responses and their ETags.
+
+    Args:
+        ticker: Normalized ticker symbol
+        price: Current stock price
+
+    Returns:
+        Tuple of (price, Unix time it was fetched, False), as from _cached_price
+    """
+    fetched_at = quote_cache.set(ticker, "price", price, settings.QUOTE_PRICE_TTL_SECONDS, new_version=True)
+    return price, fetched_at, False
+
+
+def _cached_price(ticker: str) -> Optional[Tuple[float, float, bool]]:
+    """
+    Get the cached price of a ticker, or its last known price while recent enough.
+
+    An expired price younger than QUOTE_STALE_MAX_SECONDS is returned as
+    stale, and a background revalidation is scheduled instead of waiting on
+    the upstream.
+
+    Args:
+        ticker: Normalized ticker symbol
+
+    Returns:
+        Tuple of (price, Unix time it was fetched, whether it is stale), or
+        None if the price must be fetched
+    """
+    price, fetched_at, expired = quote_cache.lookup(ticker, "price")
+    if price is MISSING:
+        return None
+    if expired:
+        if time.time() - fetched_at >= settings.QUOTE_STALE_MAX_SECONDS:
+            return None
+        quote_revalidator.schedule([ticker])
+    return price, fetched_at, expired
+
+
+def _quote(ticker: str, current_price: float, fetched_at: float, stale: bool = False) -> dict:
+    """
+    Complete a quote with its company name and dividend yield (blocking).
+
+    Each field is served from the quote cache when fresh. The name comes from
+    the stored ticker metadata, and never waits on the upstream.
+
+    Args:
+        ticker: Stock ticker symbol
+        current_price: Current stock price
+        fetched_at: Unix time the price was fetched
+        stale: Whether the price has expired and is being revalidated
+
+    Returns:
+        Quote information, with the price's asOf time (UTC, ISO format) and stale flag
+    """
+    normalized_ticker = normalize_ticker(ticker)
+    if stale:
+        count_stale_served("quote")
+
+    name = quote_cache.get(normalized_ticker, "name")
+    if name is MISSING:
+        stored = metadata.get_metadata([normalized_ticker]).get(normalized_ticker)
+        if stored is not None:
+            name = stored["name"] or ticker
+            quote_cache.set(normalized_ticker, "name", name, settings.QUOTE_INFO_TTL_SECONDS)
+        else:
+            # First sight: the background refresh stores the name for later quotes
+            name = ticker
+
+    dividend_yield = quote_cache.get(normalized_ticker, "dividendYield")
+    if dividend_yield is MISSING:
+        dividend_yield = calculate_avg_dividend_yield(normalized_ticker, current_price)
+        quote_cache.set(normalized_ticker, "dividendYield", dividend_yield, settings.QUOTE_INFO_TTL_SECONDS)
+
+    return {
+        "ticker": ticker.upper(),
+        "currentPrice": current_price,
+        "dividendYield": dividend_yield,
+        "name": name,
+        "asOf": datetime.fromtimestamp(fetched_at, timezone.utc).isoformat(timespec="seconds"),
+        "stale": stale
+    }
+
+
+def prefetch_quote_histories(tickers: List[str], refresh_price: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    Download the recent price history of every ticker needing a price, in batched downloads (blocking).
+
+    Args:
+        tickers: Stock ticker symbols
+        refresh_price: Include tickers whose cached price is fresh
+
+    Returns:
+        Recent price history by normalized ticker, to pass to fetch_quote
+        (tickers of failed downloads are absent and get fetched individually;
+        tickers served stale are absent and revalidated in the background)
+    """
+    normalized_tickers = [normalize_ticker(ticker) for ticker in tickers]
+    due = [
+        ticker for ticker in normalized_tickers
+        if refresh_price or _cached_price(ticker) is None
+    ]
+    if not due:
+        return {}
+    return upstream.fetch_history_batch(due, period=DEFAULT_HISTORY_PERIOD)
+
+
+def _revalidate_quotes(tickers: List[str]) -> List[str]:
+    """
+    Refresh the prices of quotes served stale (revalidation worker).
+
+    Args:
+        tickers: Normalized ticker symbols
+
+    Returns:
+        Tickers whose price could not be fetched
+    """
+    histories = prefetch_quote_histories(tickers, refresh_price=True)
+    failed = []
+    for ticker in tickers:
+        try:
+            if fetch_quote(ticker, refresh_price=True, hist=histories.get(ticker)) is None:
+                failed.append(ticker)
+        except Exception as e:
+            logger.warning(f"Revalidation failed for {ticker}: {str(e)}")
+            failed.append(ticker)
+    return failed
+
+
+# Refreshes stale quote prices in the background
+quote_revalidator = Revalidator("revalidate", _revalidate_quotes, settings.QUOTE_REVALIDATE_RETRY_SECONDS)
+
+
+def prefetch_quote_names(tickers: List[str]):
+    """
+    Cache the stored company names of every ticker missing one, in one query (blocking).
+
+    Args:
+        tickers: Stock ticker symbols
+    """
+    due = [
+        ticker for ticker in dict.fromkeys(normalize_ticker(ticker) for ticker in tickers)
+        if quote_cache.get(ticker, "name") is MISSING
+    ]
+    for symbol, stored in metadata.get_metadata(due).items():
+        if stored["name"]:
+            quote_cache.set(symbol, "name", stored["name"], settings.QUOTE_INFO_TTL_SECONDS)
+
+
+def prefetch_price_bars(tickers: List[str], period: str, interval: str, force: bool = False):
+    """
+    Sync the stored price bars of every ticker in batched downloads (blocking).
+
+    Best effort: tickers left unsynced are synced individually when read.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: yfinance period used for initial downloads
+        interval: yfinance interval
+        force: Sync even if the previous sync is recent
     """
     try:
-        normalized_ticker = normalize_ticker(ticker)
-        stock = yf.Ticker(normalized_ticker)
-        hist = stock.history(period=DEFAULT_HISTORY_PERIOD)
+        store.sync_price_bars_batch([normalize_ticker(ticker) for ticker in tickers], period, interval, force)
+    except Exception as e:
+        logger.warning(f"Batched price bar sync failed: {str(e)}")
 
-        if hist.empty:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Ticker {ticker} not found or no data available"
-            )
 
-        current_price = hist['Close'].iloc[-1]
-        info = stock.info
-        dividend_yield = calculate_avg_dividend_yield(stock, current_price)
+def _quote_entry(ticker: str, histories: Dict[str, pd.DataFrame]) -> dict:
+    """
+    Build the quote entry for one ticker of a batch request.
+
+    Args:
+        ticker: Stock ticker symbol
+        histories: Recent price histories from prefetch_quote_histories
 
+    Returns:
+        Quote information, or an error entry if it cannot be retrieved
+    """
+    try:
+        quote = fetch_quote(ticker, hist=histories.get(normalize_ticker(ticker)))
+        if quote is not None:
+            return quote
         return {
             "ticker": ticker.upper(),
-            "currentPrice": float(current_price),
-            "dividendYield": dividend_yield,
-            "name": info.get('longName', info.get('shortName', ticker))
+            "currentPrice": None,
+            "dividendYield": 0,
+            "error": "Ticker not found"
         }
-    except HTTPException:
-        raise
+    except Exception as e:
+        logger.error(f"Error fetching quote for {ticker}: {str(e)}")
+        return {
+            "ticker": ticker.upper(),
+            "currentPrice": None,
+            "dividendYield": 0,
+            "error": str(e)
+        }
+
+
+def _cache_etag(*parts, versions: List[Tuple[TTLCache, Any, Tuple[str, ...]]]) -> Optional[str]:
+    """
+    Build the ETag of a market response from the versions of the cache entries it is built from.
+
+    Args:
+        *parts: Values identifying the request (endpoint, tickers, parameters)
+        versions: (cache, key, fields) of every cache entry the response depends on
+
+    Returns:
+        ETag, or None if any entry is missing or expired (the response must be computed)
+    """
+    current = []
+    for cache, key, fields in versions:
+        version = cache.fresh_version(key, fields)
+        if version is None:
+            return None
+        current.append(version)
+    # Date windows (e.g. "last 5 years") move daily even when the data does not
+    return make_etag(*parts, date.today().isoformat(), *current)
+
+
+def _cache_versions(versions: List[Tuple[TTLCache, Any, Tuple[str, ...]]]) -> List[Optional[int]]:
+    """Snapshot the versions of cache entries, fresh or not (None for absent entries)."""
+    return [cache.version(key) for cache, key, _ in versions]
+
+
+async def _conditional(
+    if_none_match: Optional[str],
+    parts: tuple,
+    versions: List[Tuple[TTLCache, Any, Tuple[str, ...]]],
+    compute: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Serve a market response, or 304 Not Modified without computing it.
+
+    The ETag is taken before computing when every cache entry is fresh (so the
+    upstream is never touched for a matching client). Otherwise it is taken
+    after computing, and only if no entry changed while computing: a change
+    (a fetch made by the computation itself, or a background refresh) may or
+    may not be reflected in the body, so the tag could not be trusted to
+    describe it. Such responses go without an ETag; the next one gets it.
+
+    Args:
+        if_none_match: ETag of the client's cached copy, if any
+        parts: Values identifying the request (see _cache_etag)
+        versions: (cache, key, fields) of every cache entry the response depends on
+        compute: Coroutine function computing the response body
+
+    Returns:
+        Response with its ETag (if determinable), or a 304 response
+    """
+    tag = _cache_etag(*parts, versions=versions)
+    if tag is not None and etag_matches(if_none_match, tag):
+        return not_modified(tag)
+
+    snapshot = _cache_versions(versions) if tag is None else None
+    # Returned as a response so the body skips jsonable_encoder
+    response = FastJSONResponse(await compute())
+    if tag is None and _cache_versions(versions) == snapshot:
+        tag = _cache_etag(*parts, versions=versions)
+    if tag is not None:
+        set_etag(response, tag)
+    return response
+
+
+def _quote_versions(tickers: List[str]) -> list:
+    """Cache entries quotes for the tickers are built from."""
+    return [(quote_cache, normalize_ticker(ticker), QUOTE_FIELDS) for ticker in tickers]
+
+
+def _historical_versions(tickers: List[str], interval: str) -> list:
+    """Cache entries historical data for the tickers is built from."""
+    return [(sync_cache, (normalize_ticker(ticker), interval), ("priceBars",)) for ticker in tickers]
+
+
+def _dividends_versions(tickers: List[str]) -> list:
+    """Cache entries dividend histories for the tickers are built from."""
+    versions = []
+    for ticker in tickers:
+        normalized_ticker = normalize_ticker(ticker)
+        versions.append((sync_cache, normalized_ticker, ("dividends",)))
+        versions.append((sync_cache, (normalized_ticker, DAILY_INTERVAL), ("priceBars",)))
+    return versions
+
+
+async def _get_quote(ticker: str) -> dict:
+    """
+    Compute the single quote response.
+
+    Args:
+        ticker: Stock ticker symbol
+
+    Returns:
+        Quote information
+
+    Raises:
+        HTTPException: If ticker is not found or data cannot be retrieved
+            (503 with Retry-After while the upstream is rate limiting us)
+    """
+    try:
+        quote = await run_in_executor(fetch_quote, ticker)
+    except UpstreamThrottled as e:
+        logger.warning(f"Quote for {ticker} throttled: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
     except Exception as e:
         logger.error(f"Error fetching quote for {ticker}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+    if quote is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Ticker {ticker} not found or no data available"
+        )
+    return quote
+
+
+@router.get("/quote/{ticker}")
+async def get_quote(ticker: str, if_none_match: Optional[str] = Header(None)):
+    """
+    Get current quote information for a single ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        if_none_match: ETag of the client's cached copy, if any
+
+    Returns:
+        Quote information including current price, dividend yield, and company name
+        (304 Not Modified if the client's copy is current)
+
+    Raises:
+        HTTPException: If ticker is not found or data cannot be retrieved
+    """
+    return await _conditional(
+        if_none_match,
+        ("quote", ticker.upper()),
+        _quote_versions([ticker]),
+        partial(_get_quote, ticker)
+    )
+
 
 @router.post("/quotes")
-async def get_quotes(request: TickerRequest):
+async def get_quotes(request: TickerRequest, if_none_match: Optional[str] = Header(None)):
     """
     Get current quote information for multiple tickers.
 
     Args:
         request: Request containing list of ticker symbols
+        if_none_match: ETag of the client's cached copy, if any
+
+    Returns:
+        List of quote information for each ticker (304 Not Modified if the client's copy is current)
+    """
+    return await _conditional(
+        if_none_match,
+        ("quotes", request.tickers),
+        _quote_versions(request.tickers),
+        partial(_get_quotes, request.tickers)
+    )
+
+
+async def _get_quotes(tickers: List[str]) -> List[dict]:
+    """
+    Compute the quotes response, downloading missing prices in batches.
+
+    Args:
+        tickers: Stock ticker symbols
 
     Returns:
         List of quote information for each ticker
     """
-    results = []
-    for ticker in request.tickers:
-        try:
-            normalized_ticker = normalize_ticker(ticker)
-            stock = yf.Ticker(normalized_ticker)
-            hist = stock.history(period=DEFAULT_HISTORY_PERIOD)
+    histories = await run_in_executor(prefetch_quote_histories, tickers)
+    await run_in_executor(prefetch_quote_names, tickers)
+    return await gather_per_ticker(partial(_quote_entry, histories=histories), tickers)
 
-            if not hist.empty:
-                current_price = hist['Close'].iloc[-1]
-                info = stock.info
-                dividend_yield = calculate_avg_dividend_yield(stock, current_price)
 
-                results.append({
-                    "ticker": ticker.upper(),
-                    "currentPrice": float(current_price),
-                    "dividendYield": dividend_yield,
-                    "name": info.get('longName', info.get('shortName', ticker))
-                })
-            else:
-                results.append({
+def _historical_entry(ticker: str, request: HistoricalRequest) -> dict:
+    """
+    Build the historical price entry for one ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        request: Historical request (period, interval, format and downsampling)
+
+    Returns:
+        Historical price data, or an error entry if it cannot be retrieved
+    """
+    columnar = request.format == "columnar"
+    try:
+        normalized_ticker = normalize_ticker(ticker)
+        hist = store.get_price_bars(normalized_ticker, request.period, request.interval)
+
+        if not hist.empty:
+            with span("pandas"):
+                if request.points is not None:
+                    hist = downsample(hist, request.points)
+
+                dates = hist.index.strftime("%Y-%m-%d").tolist()
+                closes = hist['Close'].to_numpy(dtype=float).tolist()
+
+            if columnar:
+                return {
                     "ticker": ticker.upper(),
-                    "currentPrice": None,
-                    "dividendYield": 0,
-                    "error": "Ticker not found"
-                })
-        except Exception as e:
-            logger.error(f"Error fetching quote for {ticker}: {str(e)}")
-            results.append({
+                    "dates": dates,
+                    "closes": closes
+                }
+            return {
                 "ticker": ticker.upper(),
-                "currentPrice": None,
-                "dividendYield": 0,
-                "error": str(e)
-            })
+                "historical": [{"Date": date, "Close": close} for date, close in zip(dates, closes)]
+            }
+        error = "No historical data available"
+    except Exception as e:
+        logger.error(f"Error fetching historical data for {ticker}: {str(e)}")
+        error = str(e)
 
-    return results
+    if columnar:
+        return {
+            "ticker": ticker.upper(),
+            "dates": [],
+            "closes": [],
+            "error": error
+        }
+    return {
+        "ticker": ticker.upper(),
+        "historical": [],
+        "error": error
+    }
 
 
 @router.post("/historical")
-async def get_historical(request: TickerRequest):
+async def get_historical(request: HistoricalRequest, if_none_match: Optional[str] = Header(None)):
     """
     Get historical price data for multiple tickers.
 
     Args:
-        request: Request containing list of ticker symbols
+        request: Request containing list of ticker symbols, and optionally the
+            period, interval, response format and number of points
+        if_none_match: ETag of the client's cached copy, if any
 
     Returns:
-        List of historical price data (5 years, monthly) for each ticker
+        List of historical price data (5 years, monthly by default) for each ticker
+        (304 Not Modified if the client's copy is current)
     """
-    results = []
-    for ticker in request.tickers:
-        try:
-            normalized_ticker = normalize_ticker(ticker)
-            stock = yf.Ticker(normalized_ticker)
-            hist = stock.history(period=FIVE_YEAR_PERIOD, interval=MONTHLY_INTERVAL)
-
-            if not hist.empty:
-                historical_data = [
-                    {
-                        "Date": date.strftime("%Y-%m-%d"),
-                        "Close": float(row['Close'])
-                    }
-                    for date, row in hist.iterrows()
-                ]
-
-                results.append({
-                    "ticker": ticker.upper(),
-                    "historical": historical_data
-                })
-            else:
-                results.append({
-                    "ticker": ticker.upper(),
-                    "historical": [],
-                    "error": "No historical data available"
-                })
-        except Exception as e:
-            logger.error(f"Error fetching historical data for {ticker}: {str(e)}")
-            results.append({
-                "ticker": ticker.upper(),
-                "historical": [],
-                "error": str(e)
-            })
+    return await _conditional(
+        if_none_match,
+        ("historical", request.model_dump()),
+        _historical_versions(request.tickers, request.interval),
+        partial(_get_historical, request)
+    )
+
+
+async def _get_historical(request: HistoricalRequest) -> List[dict]:
+    """
+    Compute the historical response, syncing stored bars in batches first.
 
-    return results
+    Args:
+        request: Historical request
+
+    Returns:
+        List of historical price data for each ticker
+    """
+    await run_in_executor(prefetch_price_bars, request.tickers, request.period, request.interval)
+    return await gather_per_ticker(partial(_historical_entry, request=request), request.tickers)
 
 
-def _find_closest_price(hist: pd.DataFrame, payment_date: pd.Timestamp) -> tuple[float, float]:
+def _dividend_payments(dividends: pd.Series, hist: pd.DataFrame) -> List[dict]:
     """
-    Find the closest stock price to a given payment date.
+    Build the payment list of dividend events, with the yield at each ex-date.
 
     Args:
-        hist: Historical price data DataFrame
-        payment_date: Date of dividend payment
+        dividends: Dividend amounts indexed by ex-date
+        hist: Daily price history covering the ex-dates
 
     Returns:
-        Tuple of (price_at_payment, yield_percent) or (None, None) if not found
+        Dividend payments with date, amount, yield (%) and price at payment
     """
-    if hist.empty:
-        return None, None
+    with span("pandas"):
+        # Find stock price at each dividend date and calculate yield percentage
+        amounts = dividends.to_numpy(dtype=float)
+        prices = closest_prices(hist, dividends.index)
+        yields = amounts / prices * 100
+        dates = dividends.index.strftime("%Y-%m-%d")
+
+    return [
+        {
+            "date": date,
+            "amount": amount,
+            "yield": None if np.isnan(price) else round(yield_percent, 2),
+            "priceAtPayment": None if np.isnan(price) else round(price, 2)
+        }
+        for date, amount, price, yield_percent in zip(
+            dates,
+            amounts.tolist(),
+            prices.tolist(),
+            yields.tolist()
+        )
+    ]
+
+
+def _dividends_entry(ticker: str) -> dict:
+    """
+    Build the dividend payment history entry (last 10 years) for one ticker.
+
+    Args:
+        ticker: Stock ticker symbol
 
+    Returns:
+        Dividend payments with date, amount, and yield (%), or an error entry
+    """
     try:
-        # Normalize timezone
-        payment_date_normalized = payment_date.tz_localize(None) if payment_date.tz else payment_date
-        hist_dates = hist.index.tz_localize(None) if hist.index.tz else hist.index
-
-        # Find the closest index
-        closest_idx = hist_dates.searchsorted(payment_date_normalized)
-
-        # Take the closest date (before or after)
-        if closest_idx >= len(hist):
-            closest_idx = len(hist) - 1
-        elif closest_idx > 0:
-            # Choose between before and after
-            before = hist_dates[closest_idx - 1]
-            after = hist_dates[closest_idx]
-            if abs((payment_date_normalized - before).days) < abs((payment_date_normalized - after).days):
-                closest_idx = closest_idx - 1
-
-        price_at_payment = float(hist['Close'].iloc[closest_idx])
-        return price_at_payment, None
+        normalized_ticker = normalize_ticker(ticker)
+
+        # Get dividend data for the last 10 years
+        recent_dividends = store.get_dividends(normalized_ticker, store.period_start(TEN_YEAR_PERIOD))
+
+        if recent_dividends.empty and not store.has_dividends(normalized_ticker):
+            return {
+                "ticker": ticker.upper(),
+                "dividends": [],
+                "error": "No dividends available"
+            }
+
+        if recent_dividends.empty:
+            return {
+                "ticker": ticker.upper(),
+                "dividends": [],
+                "error": "No dividends in this period"
+            }
+
+        # Get price history to calculate yield (10 years of daily data)
+        hist = store.get_price_bars(normalized_ticker, TEN_YEAR_PERIOD, DAILY_INTERVAL)
+
+        return {
+            "ticker": ticker.upper(),
+            "dividends": _dividend_payments(recent_dividends, hist)
+        }
+
     except Exception as e:
-        logger.warning(f"Error finding closest price: {str(e)}")
-        return None, None
+        logger.error(f"Error fetching dividends for {ticker}: {str(e)}")
+        return {
+            "ticker": ticker.upper(),
+            "dividends": [],
+            "error": str(e)
+        }
 
 
 @router.post("/dividends")
-async def get_dividends(request: TickerRequest):
+async def get_dividends(request: TickerRequest, if_none_match: Optional[str] = Header(None)):
     """
     Get dividend payment history for the last 10 years for each ticker.
 
     Args:
         request: Request containing list of ticker symbols
+        if_none_match: ETag of the client's cached copy, if any
 
     Returns:
         List of dividend payments with date, amount, and yield (%) for each ticker
+        (304 Not Modified if the client's copy is current)
     """
-    results = []
+    return await _conditional(
+        if_none_match,
+        ("dividends", request.tickers),
+        _dividends_versions(request.tickers),
+        partial(_get_dividends, request.tickers)
+    )
 
-    for ticker in request.tickers:
-        try:
-            normalized_ticker = normalize_ticker(ticker)
-            stock = yf.Ticker(normalized_ticker)
 
-            # Get dividend data
-            dividends = stock.dividends
+async def _get_dividends(tickers: List[str]) -> List[dict]:
+    """
+    Compute the dividends response, syncing the daily bars used for yields in batches first.
 
-            if dividends.empty:
-                results.append({
-                    "ticker": ticker.upper(),
-                    "dividends": [],
-                    "error": "No dividends available"
-                })
-                continue
-
-            # Create timestamp with the same timezone as dividends
-            if dividends.index.tz is not None:
-                ten_years_ago = pd.Timestamp.now(tz=dividends.index.tz) - pd.DateOffset(years=10)
-            else:
-                ten_years_ago = pd.Timestamp.now() - pd.DateOffset(years=10)
-                ten_years_ago = ten_years_ago.tz_localize(None)
-
-            # Filter last 10 years
-            recent_dividends = dividends[dividends.index >= ten_years_ago]
-
-            if recent_dividends.empty:
-                results.append({
-                    "ticker": ticker.upper(),
-                    "dividends": [],
-                    "error": "No dividends in this period"
-                })
-                continue
-
-            # Get price history to calculate yield (10 years of daily data)
-            hist = stock.history(period=TEN_YEAR_PERIOD, interval=DAILY_INTERVAL)
-
-            # Convert to payment list with yield calculation
-            dividend_payments = []
-            for date, amount in recent_dividends.items():
-                payment = {
-                    "date": date.strftime("%Y-%m-%d"),
-                    "amount": float(amount)
-                }
+    Args:
+        tickers: Stock ticker symbols
+
+    Returns:
+        List of dividend payment histories for each ticker
+    """
+    await run_in_executor(prefetch_price_bars, tickers, TEN_YEAR_PERIOD, DAILY_INTERVAL)
+    return await gather_per_ticker(_dividends_entry, tickers)
 
-                # Find stock price at dividend date
-                price_at_payment, _ = _find_closest_price(hist, date)
 
-                if price_at_payment is not None:
-                    # Calculate yield percentage
-                    yield_percent = (float(amount) / price_at_payment) * 100
-                    payment["yield"] = round(yield_percent, 2)
-                    payment["priceAtPayment"] = round(price_at_payment, 2)
-                else:
-                    payment["yield"] = None
-                    payment["priceAtPayment"] = None
+def _dashboard_entry(ticker: str) -> dict:
+    """
+    Build the quote, monthly history and dividends of one ticker from a single daily series (blocking).
 
-                dividend_payments.append(payment)
+    The stored 10-year daily bars serve all three: the quote price is their
+    last close, the monthly history their month-end closes, and dividend
+    yields are taken against them. When no cached price can be served (even
+    stale), only the tail of that series is downloaded, instead of the separate 5-day,
+    monthly and daily downloads of /quotes, /historical and /dividends.
 
-            results.append({
-                "ticker": ticker.upper(),
-                "dividends": dividend_payments
-            })
+    Args:
+        ticker: Stock ticker symbol
+
+    Returns:
+        Dictionary with the ticker's quote, historical and dividends entries,
+        each shaped as in the corresponding endpoint (with an error if unavailable)
+    """
+    normalized_ticker = normalize_ticker(ticker)
+    symbol = ticker.upper()
+
+    try:
+        cached = _cached_price(normalized_ticker)
+        hist = store.get_price_bars(normalized_ticker, TEN_YEAR_PERIOD, DAILY_INTERVAL, force=cached is None)
+    except Exception as e:
+        logger.error(f"Error fetching dashboard data for {ticker}: {str(e)}")
+        return {
+            "quote": {"ticker": symbol, "currentPrice": None, "dividendYield": 0, "error": str(e)},
+            "historical": {"ticker": symbol, "historical": [], "error": str(e)},
+            "dividends": {"ticker": symbol, "dividends": [], "error": str(e)}
+        }
 
+    if hist.empty:
+        quote = {"ticker": symbol, "currentPrice": None, "dividendYield": 0, "error": "Ticker not found"}
+        historical = {"ticker": symbol, "historical": [], "error": "No historical data available"}
+    else:
+        try:
+            if cached is None:
+                cached = _cache_price(normalized_ticker, float(hist['Close'].iloc[-1]))
+            quote = _quote(ticker, *cached)
         except Exception as e:
-            logger.error(f"Error fetching dividends for {ticker}: {str(e)}")
-            results.append({
-                "ticker": ticker.upper(),
-                "dividends": [],
-                "error": str(e)
-            })
+            logger.error(f"Error fetching quote for {ticker}: {str(e)}")
+            quote = {"ticker": symbol, "currentPrice": None, "dividendYield": 0, "error": str(e)}
+
+        with span("pandas"):
+            # Month-end closes, dated on the first of the month like stored monthly bars
+            monthly = hist['Close'].resample("MS").last().dropna()
+            start = pd.Timestamp(store.period_start(FIVE_YEAR_PERIOD).replace(day=1))
+            monthly = monthly[monthly.index >= start]
+            dates = monthly.index.strftime("%Y-%m-%d").tolist()
+            closes = monthly.to_numpy(dtype=float).tolist()
+        historical = {
+            "ticker": symbol,
+            "historical": [{"Date": date, "Close": close} for date, close in zip(dates, closes)]
+        }
+
+    try:
+        recent_dividends = store.get_dividends(normalized_ticker, store.period_start(TEN_YEAR_PERIOD))
+        if not recent_dividends.empty:
+            dividends = {"ticker": symbol, "dividends": _dividend_payments(recent_dividends, hist)}
+        elif store.has_dividends(normalized_ticker):
+            dividends = {"ticker": symbol, "dividends": [], "error": "No dividends in this period"}
+        else:
+            dividends = {"ticker": symbol, "dividends": [], "error": "No dividends available"}
+    except Exception as e:
+        logger.error(f"Error fetching dividends for {ticker}: {str(e)}")
+        dividends = {"ticker": symbol, "dividends": [], "error": str(e)}
+
+    return {"quote": quote, "historical": historical, "dividends": dividends}
+
+
+def _prefetch_dashboard(tickers: List[str]):
+    """
+    Sync the daily bars of the dashboard tickers in batched downloads (blocking).
+
+    Tickers without a price to serve (even stale) get a forced tail refresh,
+    and their price is taken from the refreshed last close.
+
+    Args:
+        tickers: Stock ticker symbols
+    """
+    normalized_tickers = [normalize_ticker(ticker) for ticker in tickers]
+    expired = [ticker for ticker in normalized_tickers if _cached_price(ticker) is None]
+    fresh = [ticker for ticker in normalized_tickers if ticker not in expired]
+    prefetch_price_bars(fresh, TEN_YEAR_PERIOD, DAILY_INTERVAL)
+    prefetch_price_bars(expired, TEN_YEAR_PERIOD, DAILY_INTERVAL, force=True)
+
+    for ticker in expired:
+        last_bar = sync_cache.get((ticker, DAILY_INTERVAL), "priceBars")
+        if last_bar is not MISSING and last_bar is not None:
+            _cache_price(ticker, float(last_bar[1]))
+
+
+async def _get_dashboard(tickers: List[str]) -> dict:
+    """
+    Compute the dashboard response.
+
+    Args:
+        tickers: Stock ticker symbols
+
+    Returns:
+        Dictionary of quotes, historical and dividends lists, in ticker order
+    """
+    await run_in_executor(_prefetch_dashboard, tickers)
+    await run_in_executor(prefetch_quote_names, tickers)
+    entries = await gather_per_ticker(_dashboard_entry, tickers)
+    return {
+        "quotes": [entry["quote"] for entry in entries],
+        "historical": [entry["historical"] for entry in entries],
+        "dividends": [entry["dividends"] for entry in entries]
+    }
+
+
+def _dashboard_versions(tickers: List[str]) -> list:
+    """Cache entries the dashboard for the tickers is built from."""
+    return _quote_versions(tickers) + _dividends_versions(tickers)
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get quotes, monthly history (5 years) and dividends (10 years) for every position of the current user.
+
+    Entries are shaped as in /quotes, /historical and /dividends, but all
+    three are computed from one daily price series per ticker.
 
-    return results
+    Args:
+        current_user: Current authenticated user
+        if_none_match: ETag of the client's cached copy, if any
+
+    Returns:
+        Dictionary with quotes, historical and dividends lists
+        (304 Not Modified if the client's copy is current)
+    """
+    positions = await run_in_executor(crud.get_user_positions, current_user.id_user)
+    tickers = [position.ticker for position in positions]
+    return await _conditional(
+        if_none_match,
+        ("dashboard", tickers),
+        _dashboard_versions(tickers),
+        partial(_get_dashboard, tickers)
+    )
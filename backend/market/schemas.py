@@ -1,11 +1,23 @@
 """
 Pydantic schemas for market data.
 """
-from typing import List
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
 
 
 class TickerRequest(BaseModel):
     """Schema for ticker request."""
 
     tickers: List[str]
+
+
+class HistoricalRequest(TickerRequest):
+    """Schema for historical data request."""
+
+    period: Literal["1y", "2y", "5y", "10y"] = "5y"
+    interval: Literal["1d", "1wk", "1mo"] = "1mo"
+    format: Literal["rows", "columnar"] = Field(
+        "rows",
+        description="rows: list of {Date, Close}; columnar: parallel dates and closes arrays"
+    )
+    points: Optional[int] = Field(None, ge=3, description="Downsample each series to at most this many points (LTTB)")
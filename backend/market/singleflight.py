@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing of concurrent identical calls.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """In-flight call shared by every caller of the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    Callers arriving while a call for the same key is in flight wait for it
+    and receive its result, or its exception. Nothing is kept once the call
+    completes, so later callers trigger a fresh call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func, or join the in-flight call for the same key.
+
+        Args:
+            key: Identity of the call
+            func: Function to call
+            *args: Positional arguments passed to func
+            **kwargs: Keyword arguments passed to func
+
+        Returns:
+            Result of func
+
+        Raises:
+            Exception: Whatever func raised
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with the number of calls made and of callers that joined one
+        """
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,384 @@
+"""
+Persistent market data store with incremental refresh from yfinance.
+"""
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from peewee import fn, chunked
+from config import settings
+from database import db
+from timing import span
+from market.cache import sync_cache, MISSING
+from market.models import PriceBar, DividendEvent
+from market import upstream
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement when storing bars
+UPSERT_BATCH_SIZE = 500
+
+
+def period_start(period: str) -> date:
+    """
+    Convert a yfinance period string (e.g. "5d", "6mo", "10y") to its start date.
+
+    Args:
+        period: yfinance period string
+
+    Returns:
+        First date covered by the period
+    """
+    today = pd.Timestamp.now().normalize()
+    if period.endswith("mo"):
+        offset = pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith("y"):
+        offset = pd.DateOffset(years=int(period[:-1]))
+    elif period.endswith("d"):
+        offset = pd.DateOffset(days=int(period[:-1]))
+    else:
+        raise ValueError(f"Unsupported period: {period}")
+    return (today - offset).date()
+
+
+def _last_bar_date(ticker: str, interval: str) -> Optional[date]:
+    """
+    Get the date of the most recent stored bar.
+
+    Args:
+        ticker: Normalized ticker symbol
+        interval: yfinance interval
+
+    Returns:
+        Date of the last stored bar, or None if nothing is stored
+    """
+    return (PriceBar
+            .select(fn.MAX(PriceBar.date))
+            .where((PriceBar.ticker == ticker) & (PriceBar.interval == interval))
+            .scalar())
+
+
+def _last_bar_dates(tickers: List[str], interval: str) -> Dict[str, date]:
+    """
+    Get the date of the most recent stored bar of several tickers in one query.
+
+    Args:
+        tickers: Normalized ticker symbols
+        interval: yfinance interval
+
+    Returns:
+        Date of the last stored bar by ticker (tickers without bars are absent)
+    """
+    query = (PriceBar
+             .select(PriceBar.ticker, fn.MAX(PriceBar.date))
+             .where((PriceBar.ticker.in_(tickers)) & (PriceBar.interval == interval))
+             .group_by(PriceBar.ticker)
+             .tuples())
+    return dict(query)
+
+
+def _last_bar(ticker: str, interval: str) -> Optional[Tuple[date, float]]:
+    """
+    Get the date and close of the most recent stored bar.
+
+    Args:
+        ticker: Normalized ticker symbol
+        interval: yfinance interval
+
+    Returns:
+        Tuple of (date, close), or None if nothing is stored
+    """
+    return (PriceBar
+            .select(PriceBar.date, PriceBar.close)
+            .where((PriceBar.ticker == ticker) & (PriceBar.interval == interval))
+            .order_by(PriceBar.date.desc())
+            .limit(1)
+            .tuples()
+            .first())
+
+
+def _store_bars(ticker: str, interval: str, hist: pd.DataFrame) -> int:
+    """
+    Insert or update price bars from a yfinance history frame.
+
+    Args:
+        ticker: Normalized ticker symbol
+        interval: yfinance interval
+        hist: yfinance history DataFrame (OHLCV columns, datetime index)
+
+    Returns:
+        Number of bars written
+    """
+    if hist.empty:
+        return 0
+    hist = hist.dropna(subset=['Close'])
+
+    rows = [
+        {
+            "ticker": ticker,
+            "interval": interval,
+            "date": bar_date.date(),
+            "open": None if pd.isna(open_) else float(open_),
+            "high": None if pd.isna(high) else float(high),
+            "low": None if pd.isna(low) else float(low),
+            "close": float(close),
+            "volume": None if pd.isna(volume) else int(volume),
+        }
+        for bar_date, open_, high, low, close, volume in zip(
+            hist.index,
+            hist['Open'], hist['High'], hist['Low'], hist['Close'], hist['Volume']
+        )
+    ]
+
+    with db.atomic():
+        for batch in chunked(rows, UPSERT_BATCH_SIZE):
+            (PriceBar
+             .insert_many(batch)
+             .on_conflict(
+                 conflict_target=[PriceBar.ticker, PriceBar.interval, PriceBar.date],
+                 preserve=[PriceBar.open, PriceBar.high, PriceBar.low, PriceBar.close, PriceBar.volume]
+             )
+             .execute())
+    return len(rows)
+
+
+def sync_price_bars(ticker: str, period: str, interval: str, force: bool = False) -> int:
+    """
+    Fetch missing price bars from yfinance and store them.
+
+    The first sync downloads the whole period; later syncs only download the
+    tail starting at the last stored bar (which is refetched, since it may
+    have been partial). Syncs are skipped while the previous one is younger
+    than PRICE_BARS_REFRESH_SECONDS, unless forced. The sync cache records the
+    last stored bar, so its version only changes when new or revised data arrives.
+
+    Args:
+        ticker: Normalized ticker symbol
+        period: yfinance period used for the initial download
+        interval: yfinance interval
+        force: Sync even if the previous sync is recent
+
+    Returns:
+        Number of bars written
+    """
+    if not force and sync_cache.get((ticker, interval), "priceBars") is not MISSING:
+        return 0
+
+    last_date = _last_bar_date(ticker, interval)
+    if last_date is None:
+        hist = upstream.fetch_history(ticker, period=period, interval=interval)
+    else:
+        hist = upstream.fetch_history(ticker, start=last_date.isoformat(), interval=interval)
+
+    written = _store_bars(ticker, interval, hist)
+    sync_cache.set((ticker, interval), "priceBars", _last_bar(ticker, interval), settings.PRICE_BARS_REFRESH_SECONDS)
+    return written
+
+
+def sync_price_bars_batch(tickers: List[str], period: str, interval: str, force: bool = False) -> int:
+    """
+    Sync the price bars of several tickers with multi-ticker downloads.
+
+    Tickers due for a sync (see sync_price_bars) are grouped by the date their
+    download starts from (the last stored bar, or the period for tickers
+    without bars), and each group is fetched with batched downloads. Tickers
+    whose download failed, or that came back without data while nothing is
+    stored for them, are left unsynced, so the per-ticker sync of
+    get_price_bars retries them and reports their error.
+
+    Args:
+        tickers: Normalized ticker symbols
+        period: yfinance period used for initial downloads
+        interval: yfinance interval
+        force: Sync even if the previous sync is recent
+
+    Returns:
+        Number of bars written
+    """
+    due = [
+        ticker for ticker in dict.fromkeys(tickers)
+        if force or sync_cache.get((ticker, interval), "priceBars") is MISSING
+    ]
+    if not due:
+        return 0
+
+    last_dates = _last_bar_dates(due, interval)
+    groups: Dict[Optional[date], List[str]] = {}
+    for ticker in due:
+        groups.setdefault(last_dates.get(ticker), []).append(ticker)
+
+    written = 0
+    for last_date, group in groups.items():
+        if last_date is None:
+            histories = upstream.fetch_history_batch(group, period=period, interval=interval)
+        else:
+            histories = upstream.fetch_history_batch(group, start=last_date.isoformat(), interval=interval)
+        for ticker, hist in histories.items():
+            if hist.empty and last_date is None:
+                continue
+            written += _store_bars(ticker, interval, hist)
+            sync_cache.set(
+                (ticker, interval), "priceBars", _last_bar(ticker, interval), settings.PRICE_BARS_REFRESH_SECONDS
+            )
+    return written
+
+
+def get_price_bars(ticker: str, period: str, interval: str, force: bool = False) -> pd.DataFrame:
+    """
+    Get price history for a ticker, serving from the database.
+
+    Missing bars are fetched first. If the upstream fetch fails but bars are
+    already stored, the stored bars are served.
+
+    Args:
+        ticker: Normalized ticker symbol
+        period: yfinance period (e.g. "5y")
+        interval: yfinance interval (e.g. "1mo")
+        force: Refresh the tail even if the previous sync is recent
+
+    Returns:
+        DataFrame with Open/High/Low/Close/Volume columns indexed by date
+        (empty if no data is available)
+
+    Raises:
+        Exception: If the upstream fetch fails and nothing is stored
+    """
+    try:
+        sync_price_bars(ticker, period, interval, force)
+    except Exception as e:
+        if _last_bar_date(ticker, interval) is None:
+            raise
+        logger.warning(f"Serving stored bars for {ticker} ({interval}), refresh failed: {str(e)}")
+
+    start = period_start(period)
+    if interval.endswith("mo"):
+        # Monthly bars are dated on the first of the month
+        start = start.replace(day=1)
+
+    query = (PriceBar
+             .select(PriceBar.date, PriceBar.open, PriceBar.high, PriceBar.low, PriceBar.close, PriceBar.volume)
+             .where(
+                 (PriceBar.ticker == ticker) &
+                 (PriceBar.interval == interval) &
+                 (PriceBar.date >= start)
+             )
+             .order_by(PriceBar.date)
+             .tuples())
+    rows = list(query)
+    with span("pandas"):
+        hist = pd.DataFrame(rows, columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        hist['Date'] = pd.to_datetime(hist['Date'])
+        return hist.set_index('Date')
+
+
+def _last_ex_date(ticker: str) -> Optional[date]:
+    """
+    Get the most recent stored ex-dividend date.
+
+    Args:
+        ticker: Normalized ticker symbol
+
+    Returns:
+        Latest stored ex-date, or None if nothing is stored
+    """
+    return (DividendEvent
+            .select(fn.MAX(DividendEvent.ex_date))
+            .where(DividendEvent.ticker == ticker)
+            .scalar())
+
+
+def sync_dividends(ticker: str, force: bool = False) -> int:
+    """
+    Fetch dividend events newer than the latest stored ex-date and store them.
+
+    The first sync downloads the full dividend history; later syncs only read
+    the dividends column of the daily history since the latest stored
+    ex-date. Syncs are skipped while the previous one is younger than
+    DIVIDENDS_REFRESH_SECONDS, unless forced. The sync cache records the
+    latest stored ex-date, so its version only changes when events are added.
+
+    Args:
+        ticker: Normalized ticker symbol
+        force: Sync even if the previous sync is recent
+
+    Returns:
+        Number of events written
+    """
+    if not force and sync_cache.get(ticker, "dividends") is not MISSING:
+        return 0
+
+    last_ex_date = _last_ex_date(ticker)
+    if last_ex_date is None:
+        dividends = upstream.fetch_dividends(ticker)
+    else:
+        hist = upstream.fetch_history(ticker, start=(last_ex_date + timedelta(days=1)).isoformat(), interval="1d")
+        dividends = hist['Dividends'] if 'Dividends' in hist else pd.Series(dtype=float)
+        dividends = dividends[dividends > 0]
+
+    rows = [
+        {"ticker": ticker, "ex_date": ex_date.date(), "amount": float(amount)}
+        for ex_date, amount in dividends.items()
+    ]
+    if rows:
+        with db.atomic():
+            for batch in chunked(rows, UPSERT_BATCH_SIZE):
+                (DividendEvent
+                 .insert_many(batch)
+                 .on_conflict(
+                     conflict_target=[DividendEvent.ticker, DividendEvent.ex_date],
+                     preserve=[DividendEvent.amount]
+                 )
+                 .execute())
+
+    sync_cache.set(ticker, "dividends", _last_ex_date(ticker), settings.DIVIDENDS_REFRESH_SECONDS)
+    return len(rows)
+
+
+def has_dividends(ticker: str) -> bool:
+    """
+    Check whether any dividend event is stored for a ticker.
+
+    Args:
+        ticker: Normalized ticker symbol
+
+    Returns:
+        True if at least one event is stored
+    """
+    return DividendEvent.select().where(DividendEvent.ticker == ticker).exists()
+
+
+def get_dividends(ticker: str, start: date) -> pd.Series:
+    """
+    Get dividend events since a date, serving from the database.
+
+    New events are synced first. If the upstream sync fails but events are
+    already stored, the stored events are served.
+
+    Args:
+        ticker: Normalized ticker symbol
+        start: First ex-date to include
+
+    Returns:
+        Series of dividend amounts indexed by ex-date (ascending)
+
+    Raises:
+        Exception: If the upstream sync fails and nothing is stored
+    """
+    try:
+        sync_dividends(ticker)
+    except Exception as e:
+        if _last_ex_date(ticker) is None:
+            raise
+        logger.warning(f"Serving stored dividends for {ticker}, sync failed: {str(e)}")
+
+    query = (DividendEvent
+             .select(DividendEvent.ex_date, DividendEvent.amount)
+             .where((DividendEvent.ticker == ticker) & (DividendEvent.ex_date >= start))
+             .order_by(DividendEvent.ex_date)
+             .tuples())
+    rows = list(query)
+    with span("pandas"):
+        index = pd.to_datetime([ex_date for ex_date, _ in rows])
+        return pd.Series([amount for _, amount in rows], index=index, dtype=float, name='Dividends')
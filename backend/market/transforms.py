@@ -0,0 +1,113 @@
+"""
+Vectorized transformations of market data series.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _naive_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Drop the timezone of a datetime index, if any."""
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def closest_prices(hist: pd.DataFrame, dates: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Find the closing price nearest to each date in one vectorized join.
+
+    When a date is equally far from the bars before and after it, the bar
+    after is used.
+
+    Args:
+        hist: Historical price data with a Close column, sorted by date
+        dates: Dates to match (e.g. dividend payment dates)
+
+    Returns:
+        Array of closing prices aligned with dates (NaN if hist is empty)
+    """
+    if hist.empty:
+        return np.full(len(dates), np.nan)
+
+    hist_dates = _naive_index(pd.DatetimeIndex(hist.index)).values
+    target_dates = _naive_index(pd.DatetimeIndex(dates)).values
+    closes = hist['Close'].to_numpy(dtype=float)
+
+    # Index of the first bar on or after each date, and of the bar before it
+    after = np.minimum(hist_dates.searchsorted(target_dates), len(hist_dates) - 1)
+    before = np.maximum(after - 1, 0)
+
+    after_gap = np.abs(target_dates - hist_dates[after])
+    before_gap = np.abs(target_dates - hist_dates[before])
+    closest = np.where(before_gap < after_gap, before, after)
+
+    return closes[closest]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points of a series with Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, for each of the threshold - 2
+    buckets in between, the point forming the largest triangle with the
+    previously selected point and the average of the next bucket. This
+    preserves peaks and troughs far better than taking every n-th point.
+
+    Args:
+        x: Sorted x coordinates (e.g. dates as numbers)
+        y: y coordinates
+        threshold: Number of points to keep (at least 3)
+
+    Returns:
+        Sorted array of selected indices
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket boundaries for every point except the first and last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Triangle areas (times two) between previous point, candidates and next average
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample(hist: pd.DataFrame, points: int) -> pd.DataFrame:
+    """
+    Downsample a price history to a number of points with LTTB on the Close column.
+
+    Args:
+        hist: Historical price data with a Close column, sorted by date
+        points: Maximum number of points to keep
+
+    Returns:
+        DataFrame with at most points rows (unchanged if already small enough)
+    """
+    if len(hist) <= points:
+        return hist
+
+    dates = _naive_index(pd.DatetimeIndex(hist.index))
+    x = (dates - dates[0]) / pd.Timedelta(days=1)
+    indices = lttb_indices(np.asarray(x, dtype=float), hist['Close'].to_numpy(dtype=float), points)
+    return hist.iloc[indices]
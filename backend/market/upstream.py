@@ -0,0 +1,219 @@
+"""
+Upstream market data access.
+
+Every call to the market data provider (yfinance, or the replay stand-in set
+by MARKET_DATA_PROVIDER) goes through this module. Concurrent requests for the
+same (ticker, dataset, period, interval) share a single in-flight fetch, every
+actual fetch goes through the shared rate limiter (retrying with backoff when
+the provider throttles), and is timed by operation.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from peewee import chunked
+from config import settings
+from market.providers import MarketDataProvider, create_provider
+from market.ratelimit import PriorityRateLimiter, UpstreamThrottled, backoff_delay, current_lane
+from market.singleflight import SingleFlight
+from metrics import observe_upstream, observe_limiter_wait, count_upstream_throttled, count_upstream_rejected
+from timing import record, span
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Coalesces identical concurrent upstream fetches
+upstream_flight = SingleFlight()
+
+# Caps the rate of calls to the provider, interactive calls first
+upstream_limiter = PriorityRateLimiter(
+    rate=settings.UPSTREAM_RATE_PER_SECOND,
+    burst=settings.UPSTREAM_BURST
+)
+
+# Source of market data
+_provider: MarketDataProvider = create_provider(
+    settings.MARKET_DATA_PROVIDER,
+    fixtures_dir=settings.MARKET_FIXTURES_DIR,
+    latency_seconds=settings.MARKET_REPLAY_LATENCY_MS / 1000,
+    jitter_seconds=settings.MARKET_REPLAY_JITTER_MS / 1000
+)
+
+
+def get_provider() -> MarketDataProvider:
+    """Get the current market data provider."""
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider):
+    """
+    Replace the market data provider (benchmarks, tests).
+
+    Args:
+        provider: Provider used by all subsequent fetches
+    """
+    global _provider
+    _provider = provider
+
+
+def _call(operation: str, cost: int, func: Callable, *args) -> Any:
+    """
+    Call the provider through the rate limiter.
+
+    When the provider throttles the call, the limiter is paused for an
+    exponential backoff delay with jitter, and the call is retried up to
+    UPSTREAM_MAX_RETRIES times.
+
+    Args:
+        operation: Operation label (e.g. "history")
+        cost: Limiter tokens taken (number of tickers fetched)
+        func: Provider method
+        *args: Positional arguments passed to func
+
+    Returns:
+        Result of func
+
+    Raises:
+        UpstreamThrottled: If no token is available in time, or the provider
+            still throttles after the last retry
+    """
+    lane = current_lane()
+    for attempt in range(settings.UPSTREAM_MAX_RETRIES + 1):
+        try:
+            waited = upstream_limiter.acquire(lane, cost, timeout=settings.UPSTREAM_LIMITER_TIMEOUT_SECONDS)
+        except UpstreamThrottled:
+            count_upstream_rejected(lane, "limiter_timeout")
+            raise
+        observe_limiter_wait(lane, waited)
+        record("limiter", waited)
+
+        try:
+            with observe_upstream(operation), span("upstream"):
+                return func(*args)
+        except Exception as e:
+            if not _provider.is_throttled(e):
+                raise
+            count_upstream_throttled(operation)
+            delay = backoff_delay(attempt, settings.UPSTREAM_BACKOFF_BASE_SECONDS, settings.UPSTREAM_BACKOFF_MAX_SECONDS)
+            if attempt == settings.UPSTREAM_MAX_RETRIES:
+                count_upstream_rejected(lane, "throttled")
+                upstream_limiter.pause(delay)
+                raise UpstreamThrottled(retry_after=delay) from e
+            logger.warning(f"Provider throttled {operation}, backing off {delay:.1f}s (attempt {attempt + 1})")
+            upstream_limiter.pause(delay)
+
+
+def _history(ticker: str, period: Optional[str], interval: str, start: Optional[str]) -> pd.DataFrame:
+    """Download price history from the provider."""
+    return _call("history", 1, _provider.history, ticker, period, interval, start)
+
+
+def _download(
+    tickers: Tuple[str, ...],
+    period: Optional[str],
+    interval: str,
+    start: Optional[str]
+) -> Dict[str, pd.DataFrame]:
+    """Download the price history of several tickers from the provider."""
+    return _call("download", len(tickers), _provider.download, list(tickers), period, interval, start)
+
+
+def _info(ticker: str) -> dict:
+    """Download company information from the provider."""
+    return _call("info", 1, _provider.info, ticker)
+
+
+def _dividends(ticker: str) -> pd.Series:
+    """Download the dividend history from the provider."""
+    return _call("dividends", 1, _provider.dividends, ticker)
+
+
+def fetch_history(
+    ticker: str,
+    period: Optional[str] = None,
+    interval: str = "1d",
+    start: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Fetch price history for a ticker.
+
+    Args:
+        ticker: Normalized ticker symbol
+        period: yfinance period (ignored when start is given)
+        interval: yfinance interval
+        start: First date to fetch (ISO format)
+
+    Returns:
+        yfinance history DataFrame (shared between coalesced callers, do not mutate)
+    """
+    key = (ticker, "history", f"start={start}" if start else period, interval)
+    return upstream_flight.do(key, _history, ticker, period, interval, start)
+
+
+def fetch_history_batch(
+    tickers: List[str],
+    period: Optional[str] = None,
+    interval: str = "1d",
+    start: Optional[str] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch price history for several tickers in multi-ticker downloads.
+
+    Tickers are downloaded in chunks of MARKET_DOWNLOAD_CHUNK_SIZE, one
+    provider call per chunk. yf.download does not raise for tickers it failed
+    to download (throttled ones included), it leaves their frame empty; so
+    tickers that come back without data are left out, like every ticker of a
+    chunk whose download fails. Callers fall back to per-ticker fetches for
+    them, which raise the actual error and back off when throttled.
+
+    Args:
+        tickers: Normalized ticker symbols
+        period: yfinance period (ignored when start is given)
+        interval: yfinance interval
+        start: First date to fetch (ISO format)
+
+    Returns:
+        Non-empty yfinance history DataFrame per downloaded ticker (shared
+        between coalesced callers, do not mutate)
+    """
+    histories: Dict[str, pd.DataFrame] = {}
+    for chunk in chunked(sorted(set(tickers)), settings.MARKET_DOWNLOAD_CHUNK_SIZE):
+        chunk = tuple(chunk)
+        key = (chunk, "download", f"start={start}" if start else period, interval)
+        try:
+            downloaded = upstream_flight.do(key, _download, chunk, period, interval, start)
+        except UpstreamThrottled as e:
+            # Later chunks would be throttled too
+            logger.warning(f"Batched download of {len(chunk)} tickers throttled: {str(e)}")
+            break
+        except Exception as e:
+            logger.warning(f"Batched download of {len(chunk)} tickers failed: {str(e)}")
+            continue
+        histories.update((ticker, hist) for ticker, hist in downloaded.items() if not hist.empty)
+    return histories
+
+
+def fetch_info(ticker: str) -> dict:
+    """
+    Fetch company information for a ticker.
+
+    Args:
+        ticker: Normalized ticker symbol
+
+    Returns:
+        yfinance info dictionary (shared between coalesced callers, do not mutate)
+    """
+    return upstream_flight.do((ticker, "info", None, None), _info, ticker)
+
+
+def fetch_dividends(ticker: str) -> pd.Series:
+    """
+    Fetch the full dividend history for a ticker.
+
+    Args:
+        ticker: Normalized ticker symbol
+
+    Returns:
+        Series of dividend amounts indexed by ex-date (shared between coalesced callers, do not mutate)
+    """
+    return upstream_flight.do((ticker, "dividends", None, None), _dividends, ticker)
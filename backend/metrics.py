@@ -0,0 +1,351 @@
+"""
+Prometheus metrics: HTTP routes, database queries, upstream calls, rate limiting and caches.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Latency buckets (seconds) covering cached responses up to slow upstream fetches
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Route label of requests matching no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being processed by route",
+    ["method", "route"]
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per HTTP request",
+    ["route"],
+    buckets=LATENCY_BUCKETS
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database query latency by statement type",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+)
+UPSTREAM_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Market data provider call latency by operation",
+    ["operation", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds",
+    "Time password hashing work waited for a free worker",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password on a worker",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+UPSTREAM_LIMITER_WAIT = Histogram(
+    "upstream_limiter_wait_seconds",
+    "Time upstream calls waited for a rate limiter token, by priority lane",
+    ["lane"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+UPSTREAM_THROTTLED = Counter(
+    "upstream_throttled",
+    "Throttling responses from the market data provider",
+    ["operation"]
+)
+UPSTREAM_REJECTED = Counter(
+    "upstream_rejected",
+    "Upstream calls given up (limiter timeout, or still throttled after retries)",
+    ["lane", "reason"]
+)
+
+STALE_SERVED = Counter(
+    "market_stale_served",
+    "Expired market data served while it is revalidated in the background",
+    ["dataset"]
+)
+
+
+class _RequestQueries:
+    """Database queries of one request (updated from any worker thread)."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+
+
+_request_queries: ContextVar[Optional[_RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def observe_db_query(sql: str, seconds: float):
+    """
+    Record a database query.
+
+    Args:
+        sql: SQL statement
+        seconds: Execution time in seconds
+    """
+    statement = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "UNKNOWN"
+    DB_QUERY_DURATION.labels(statement).observe(seconds)
+    queries = _request_queries.get()
+    if queries is not None:
+        queries.add(seconds)
+
+
+@contextmanager
+def observe_upstream(operation: str) -> Iterator[None]:
+    """
+    Time a call to the market data provider.
+
+    Args:
+        operation: Operation label (e.g. "history", "info", "dividends")
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_DURATION.labels(operation, outcome).observe(time.perf_counter() - start)
+
+
+def observe_password_hash(wait_seconds: float, hash_seconds: float):
+    """
+    Record the queue wait and duration of password hashing work.
+
+    Args:
+        wait_seconds: Time waited for a free hashing worker
+        hash_seconds: Time spent on the worker
+    """
+    PASSWORD_HASH_WAIT.observe(wait_seconds)
+    PASSWORD_HASH_DURATION.observe(hash_seconds)
+
+
+def observe_limiter_wait(lane: str, seconds: float):
+    """
+    Record the time an upstream call waited for the rate limiter.
+
+    Args:
+        lane: Priority lane of the call
+        seconds: Wait in seconds
+    """
+    UPSTREAM_LIMITER_WAIT.labels(lane).observe(seconds)
+
+
+def count_upstream_throttled(operation: str):
+    """
+    Count a throttling response from the market data provider.
+
+    Args:
+        operation: Operation label (e.g. "history")
+    """
+    UPSTREAM_THROTTLED.labels(operation).inc()
+
+
+def count_upstream_rejected(lane: str, reason: str):
+    """
+    Count an upstream call given up.
+
+    Args:
+        lane: Priority lane of the call
+        reason: "limiter_timeout" or "throttled"
+    """
+    UPSTREAM_REJECTED.labels(lane, reason).inc()
+
+
+def count_stale_served(dataset: str):
+    """
+    Count expired market data served stale.
+
+    Args:
+        dataset: Dataset label (e.g. "quote")
+    """
+    STALE_SERVED.labels(dataset).inc()
+
+
+class InstrumentedRoute(APIRoute):
+    """API route tracking its in-flight requests (use as a router's route_class)."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        path = self.path
+
+        async def instrumented_handler(request: Request) -> Response:
+            in_progress = REQUESTS_IN_PROGRESS.labels(request.method, path)
+            in_progress.inc()
+            try:
+                return await handler(request)
+            finally:
+                in_progress.dec()
+
+        return instrumented_handler
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency and database usage of each HTTP
+    request, labelled by route path template.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        queries = _RequestQueries()
+        token = _request_queries.set(queries)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Routing stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_LATENCY.labels(scope["method"], route, status).observe(time.perf_counter() - start)
+            REQUEST_DB_QUERIES.labels(route).observe(queries.count)
+            REQUEST_DB_DURATION.labels(route).observe(queries.seconds)
+            _request_queries.reset(token)
+
+
+class StatsCollector:
+    """
+    Exposes application counters (caches, coalescing, pools) at scrape time.
+
+    Sources are read when Prometheus scrapes, so nothing has to be updated on
+    the hot path.
+    """
+
+    def __init__(
+        self,
+        caches: Dict[str, Callable[[], dict]],
+        single_flight: Callable[[], dict],
+        password_hasher: Callable[[], dict],
+        db_pool: Callable[[], dict],
+        upstream_limiter: Callable[[], dict]
+    ):
+        """
+        Args:
+            caches: Stats functions of TTLCache instances, by cache name
+            single_flight: Function returning upstream coalescing counters (calls, coalesced)
+            password_hasher: Password hasher stats function
+            db_pool: Database pool stats function
+            upstream_limiter: Upstream rate limiter stats function
+        """
+        self.caches = caches
+        self.single_flight = single_flight
+        self.password_hasher = password_hasher
+        self.db_pool = db_pool
+        self.upstream_limiter = upstream_limiter
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+        evictions = CounterMetricFamily("cache_evictions", "Cache LRU evictions", labels=["cache"])
+        entries = GaugeMetricFamily("cache_entries", "Keys currently cached", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "Cache hits over lookups since start", labels=["cache"])
+        for name, stats in self.caches.items():
+            cache = stats()
+            lookups = cache["hits"] + cache["misses"]
+            hits.add_metric([name], cache["hits"])
+            misses.add_metric([name], cache["misses"])
+            evictions.add_metric([name], cache["evictions"])
+            entries.add_metric([name], cache["size"])
+            ratio.add_metric([name], cache["hits"] / lookups if lookups else 0.0)
+        yield from (hits, misses, evictions, entries, ratio)
+
+        flight = self.single_flight()
+        yield CounterMetricFamily(
+            "upstream_calls", "Upstream fetches started (coalescing leaders)", value=flight["calls"]
+        )
+        yield CounterMetricFamily(
+            "upstream_coalesced", "Upstream fetches served by joining an in-flight call", value=flight["coalesced"]
+        )
+
+        hasher = self.password_hasher()
+        yield GaugeMetricFamily("password_hash_workers", "Password hashing worker threads", value=hasher["workers"])
+        yield GaugeMetricFamily("password_hash_queue_depth", "Password hashes waiting for a free worker", value=hasher["queueDepth"])
+        yield CounterMetricFamily("password_hash_completed", "Password hashes completed", value=hasher["completed"])
+        yield CounterMetricFamily("password_hash_rejected", "Password hashes rejected (503)", value=hasher["rejected"])
+
+        pool = self.db_pool()
+        connections = GaugeMetricFamily("db_pool_connections", "Pooled database connections", labels=["state"])
+        connections.add_metric(["in_use"], pool["inUse"])
+        connections.add_metric(["idle"], pool["idle"])
+        yield connections
+        yield GaugeMetricFamily("db_pool_max_connections", "Database pool capacity", value=pool["maxConnections"])
+
+        limiter = self.upstream_limiter()
+        yield GaugeMetricFamily("upstream_limiter_tokens", "Upstream rate limiter tokens available", value=limiter["tokens"])
+        waiting = GaugeMetricFamily("upstream_limiter_waiting", "Upstream calls waiting for a token", labels=["lane"])
+        for lane, count in limiter["waiting"].items():
+            waiting.add_metric([lane], count)
+        yield waiting
+        yield GaugeMetricFamily(
+            "upstream_limiter_paused_seconds", "Remaining upstream backoff pause", value=limiter["pausedSeconds"]
+        )
+
+
+_collector: Optional[StatsCollector] = None
+
+
+def register_collector(collector: StatsCollector):
+    """
+    Register the application stats collector, replacing any previous one.
+
+    Args:
+        collector: Collector to register
+    """
+    global _collector
+    if _collector is not None:
+        REGISTRY.unregister(_collector)
+    REGISTRY.register(collector)
+    _collector = collector
+
+
+def metrics_response() -> Response:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Response for the /metrics endpoint
+    """
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
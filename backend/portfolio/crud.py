@@ -2,13 +2,21 @@
 CRUD operations for portfolio positions.
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 from decimal import Decimal
-from peewee import DoesNotExist
+from peewee import DoesNotExist, EXCLUDED, fn, chunked
+from database import db
 from portfolio.models import Position
 from auth.models import User
 
 
+# Rows per INSERT ... ON CONFLICT statement in bulk upserts
+UPSERT_BATCH_SIZE = 500
+
+# Rows fetched per query when streaming positions
+EXPORT_BATCH_SIZE = 1000
+
+
 def get_user_positions(id_user: str) -> List[Position]:
     """
     Get all positions for a specific user.
@@ -22,6 +30,86 @@ def get_user_positions(id_user: str) -> List[Position]:
     return list(Position.select().where(Position.user == id_user).order_by(Position.ticker))
 
 
+def get_user_position_rows(id_user: str) -> List[dict]:
+    """
+    Get all positions for a user as plain rows, keyed by their API field names.
+
+    Skips building model instances, for read-only listings.
+
+    Args:
+        id_user: User ID
+
+    Returns:
+        List of dictionaries with id, ticker, quantity, buyPrice, color,
+        createdAt and updatedAt
+    """
+    return list(Position
+                .select(
+                    Position.id,
+                    Position.ticker,
+                    Position.quantity,
+                    Position.buy_price.alias("buyPrice"),
+                    Position.color,
+                    Position.created_at.alias("createdAt"),
+                    Position.updated_at.alias("updatedAt")
+                )
+                .where(Position.user == id_user)
+                .order_by(Position.ticker)
+                .dicts())
+
+
+def get_positions_version(id_user: str) -> Tuple[Optional[datetime], int]:
+    """
+    Get what identifies the current state of a user's positions.
+
+    Every write sets updated_at, and deletions change the count, so this
+    changes whenever any position of the user does.
+
+    Args:
+        id_user: User ID
+
+    Returns:
+        Tuple of (latest updated_at, number of positions)
+    """
+    return (Position
+            .select(fn.MAX(Position.updated_at), fn.COUNT(Position.id))
+            .where(Position.user == id_user)
+            .tuples()
+            .get())
+
+
+def iter_user_positions(id_user: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Stream a user's positions ordered by ticker, one batch in memory at a time.
+
+    Batches are fetched with keyset pagination on the (user, ticker) unique
+    index, each on a connection checked out for that batch only, so the
+    iterator can be advanced from any thread (e.g. by a streaming response).
+
+    Args:
+        id_user: User ID
+        batch_size: Number of rows fetched per query
+
+    Yields:
+        Position rows as dictionaries with ticker, quantity, buy_price and color
+    """
+    last_ticker = None
+    while True:
+        query = (Position
+                 .select(Position.ticker, Position.quantity, Position.buy_price, Position.color)
+                 .where(Position.user == id_user))
+        if last_ticker is not None:
+            query = query.where(Position.ticker > last_ticker)
+
+        with db.connection_context():
+            rows = list(query.order_by(Position.ticker).limit(batch_size).dicts())
+
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last_ticker = rows[-1]["ticker"]
+
+
 def get_position(position_id: int, id_user: str) -> Optional[Position]:
     """
     Get a specific position by ID for a user.
@@ -167,3 +255,66 @@ def upsert_position(
     except DoesNotExist:
         # Create new position
         return create_position(id_user, ticker, quantity, buy_price, color)
+
+
+def bulk_upsert_positions(
+    id_user: str,
+    positions: Iterable[Tuple[str, Decimal, Decimal, Optional[str]]]
+) -> List[Position]:
+    """
+    Create or update many positions with batched INSERT ... ON CONFLICT statements.
+
+    All batches run in a single transaction, so either every position is
+    imported or none is. When a ticker appears more than once, the last
+    occurrence wins. An existing color is kept when no color is given.
+
+    Args:
+        id_user: User ID
+        positions: Iterable of (ticker, quantity, buy_price, color) tuples
+
+    Returns:
+        Created or updated positions, in order of first appearance of each ticker
+    """
+    now = datetime.now()
+    rows = {}
+    for ticker, quantity, buy_price, color in positions:
+        rows[ticker.upper()] = {
+            "user": id_user,
+            "ticker": ticker.upper(),
+            "quantity": quantity,
+            "buy_price": buy_price,
+            "color": color or None,
+            "created_at": now,
+            "updated_at": now,
+        }
+    if not rows:
+        return []
+
+    upserted = []
+    with db.atomic():
+        for batch in chunked(rows.values(), UPSERT_BATCH_SIZE):
+            query = (Position
+                     .insert_many(batch)
+                     .on_conflict(
+                         conflict_target=[Position.user, Position.ticker],
+                         update={
+                             Position.quantity: EXCLUDED.quantity,
+                             Position.buy_price: EXCLUDED.buy_price,
+                             Position.color: fn.COALESCE(EXCLUDED.color, Position.color),
+                             Position.updated_at: EXCLUDED.updated_at,
+                         }
+                     ))
+            if db.returning_clause:
+                upserted.extend(query.returning(Position).execute())
+            else:
+                query.execute()
+
+        if not db.returning_clause:
+            # No RETURNING support: read the rows back inside the same transaction
+            for tickers in chunked(rows, UPSERT_BATCH_SIZE):
+                upserted.extend(Position.select().where(
+                    (Position.user == id_user) & (Position.ticker.in_(tickers))
+                ))
+
+    order = {ticker: index for index, ticker in enumerate(rows)}
+    return sorted(upserted, key=lambda position: order[position.ticker])
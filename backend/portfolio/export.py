@@ -0,0 +1,77 @@
+"""
+Streaming serialization of exported positions.
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+
+# Media type of each export format
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = ("ticker", "quantity", "buyPrice", "color")
+
+
+def _export_record(row: dict) -> dict:
+    """Convert a position row to its export representation (the import format)."""
+    return {
+        "ticker": row["ticker"],
+        "quantity": float(row["quantity"]),
+        "buyPrice": float(row["buy_price"]),
+        "color": row["color"]
+    }
+
+
+def _json_chunks(rows: Iterable[dict]) -> Iterator[str]:
+    """Serialize rows as a single JSON array, one element at a time."""
+    yield "["
+    for index, row in enumerate(rows):
+        yield ("," if index else "") + json.dumps(_export_record(row))
+    yield "]"
+
+
+def _ndjson_chunks(rows: Iterable[dict]) -> Iterator[str]:
+    """Serialize rows as JSON Lines."""
+    for row in rows:
+        yield json.dumps(_export_record(row)) + "\n"
+
+
+def _csv_chunks(rows: Iterable[dict]) -> Iterator[str]:
+    """Serialize rows as CSV with a header line."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(_export_record(row))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there are no rows
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+_SERIALIZERS = {
+    "json": _json_chunks,
+    "ndjson": _ndjson_chunks,
+    "csv": _csv_chunks,
+}
+
+
+def stream_export(rows: Iterable[dict], export_format: str) -> Iterator[str]:
+    """
+    Serialize position rows incrementally in an export format.
+
+    Args:
+        rows: Position rows with ticker, quantity, buy_price and color
+        export_format: One of "json", "ndjson" or "csv"
+
+    Returns:
+        Iterator of text chunks
+    """
+    return _SERIALIZERS[export_format](rows)
@@ -1,37 +1,102 @@
 """
 Portfolio API routes.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from functools import partial
+from typing import List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from peewee import IntegrityError
 from auth.models import User
 from auth.dependencies import get_current_user
+from database import run_in_db_executor
+from etag import make_etag, etag_matches, not_modified, set_etag
+from metrics import InstrumentedRoute
+from serialization import FastJSONResponse
 from portfolio.schemas import (
     PositionCreate,
     PositionUpdate,
     PositionResponse,
+    PositionListItem,
     BulkImportRequest,
     PositionImport
 )
+from market import metadata
+from market.routes import normalize_ticker
 from portfolio import crud
+from portfolio.export import stream_export, EXPORT_MEDIA_TYPES
 
 
-router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
+router = APIRouter(prefix="/portfolio", tags=["Portfolio"], route_class=InstrumentedRoute)
 
 
-@router.get("/positions", response_model=List[PositionResponse])
-async def list_positions(current_user: User = Depends(get_current_user)):
+def _positions_etag(id_user: str, *parts) -> str:
     """
-    Get all positions for the current user.
+    Build the ETag of a positions representation for a user.
 
     Args:
+        id_user: User ID
+        *parts: Values identifying the representation (e.g. a position ID)
+
+    Returns:
+        ETag derived from the latest update time and count of the user's positions
+    """
+    return make_etag("positions", id_user, *crud.get_positions_version(id_user), *parts)
+
+
+def _position_list(id_user: str) -> Tuple[str, List[dict]]:
+    """
+    Get the positions listing rows of a user, with their ticker metadata, and their ETag (blocking).
+
+    The ETag is derived from the rows themselves, so it only changes with the
+    user's positions or the metadata of their own tickers.
+
+    Args:
+        id_user: User ID
+
+    Returns:
+        Tuple of (ETag, position rows shaped like PositionListItem)
+    """
+    rows = crud.get_user_position_rows(id_user)
+    symbols = {row["ticker"]: normalize_ticker(row["ticker"]) for row in rows}
+    stored = metadata.get_metadata(list(symbols.values()))
+    for row in rows:
+        ticker_metadata = stored.get(symbols[row["ticker"]], {})
+        row["name"] = ticker_metadata.get("name")
+        row["currency"] = ticker_metadata.get("currency")
+        row["exchange"] = ticker_metadata.get("exchange")
+
+    etag = make_etag(
+        "positions", id_user,
+        max((row["updatedAt"] for row in rows), default=None), len(rows),
+        max((row["refreshedAt"] for row in stored.values()), default=None), len(stored),
+    )
+    return etag, rows
+
+
+@router.get("/positions", response_model=List[PositionListItem])
+async def list_positions(
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get all positions for the current user, with the name, currency and
+    exchange of their tickers (null until first fetched in the background).
+
+    Args:
+        if_none_match: ETag of the client's cached copy, if any
         current_user: Current authenticated user
 
     Returns:
-        List of positions
+        List of positions, or 304 Not Modified if the client's copy is current
     """
-    positions = crud.get_user_positions(current_user.id_user)
-    return [PositionResponse.model_validate(p) for p in positions]
+    etag, rows = await run_in_db_executor(_position_list, current_user.id_user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # Rows are already shaped like PositionListItem, skip per-row model validation
+    response = FastJSONResponse(rows)
+    set_etag(response, etag)
+    return response
 
 
 @router.post("/positions", response_model=PositionResponse, status_code=status.HTTP_201_CREATED)
@@ -53,13 +118,14 @@ async def create_position(
         HTTPException: If position with same ticker already exists
     """
     try:
-        position = crud.create_position(
+        position = await run_in_db_executor(partial(
+            crud.create_position,
             id_user=current_user.id_user,
             ticker=position_data.ticker,
             quantity=position_data.quantity,
             buy_price=position_data.buy_price,
             color=position_data.color
-        )
+        ))
         return PositionResponse.model_validate(position)
     except IntegrityError:
         raise HTTPException(
@@ -71,6 +137,8 @@ async def create_position(
 @router.get("/positions/{position_id}", response_model=PositionResponse)
 async def get_position(
     position_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -78,20 +146,27 @@ async def get_position(
 
     Args:
         position_id: Position ID
+        response: Response (receives the ETag)
+        if_none_match: ETag of the client's cached copy, if any
         current_user: Current authenticated user
 
     Returns:
-        Position details
+        Position details, or 304 Not Modified if the client's copy is current
 
     Raises:
         HTTPException: If position not found
     """
-    position = crud.get_position(position_id, current_user.id_user)
+    etag = await run_in_db_executor(_positions_etag, current_user.id_user, position_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    position = await run_in_db_executor(crud.get_position, position_id, current_user.id_user)
     if not position:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Position not found"
         )
+    set_etag(response, etag)
     return PositionResponse.model_validate(position)
 
 
@@ -115,13 +190,14 @@ async def update_position(
     Raises:
         HTTPException: If position not found
     """
-    position = crud.update_position(
+    position = await run_in_db_executor(partial(
+        crud.update_position,
         position_id=position_id,
         id_user=current_user.id_user,
         quantity=position_data.quantity,
         buy_price=position_data.buy_price,
         color=position_data.color
-    )
+    ))
     if not position:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,7 +221,7 @@ async def delete_position(
     Raises:
         HTTPException: If position not found
     """
-    success = crud.delete_position(position_id, current_user.id_user)
+    success = await run_in_db_executor(crud.delete_position, position_id, current_user.id_user)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -160,7 +236,8 @@ async def bulk_import_positions(
 ):
     """
     Bulk import positions from JSON file.
-    Creates new positions or updates existing ones based on ticker.
+    Creates new positions or updates existing ones based on ticker, in a
+    single transaction (the import is all-or-nothing).
 
     Args:
         import_data: Bulk import data with list of positions
@@ -169,40 +246,38 @@ async def bulk_import_positions(
     Returns:
         List of created/updated positions
     """
-    imported_positions = []
-
-    for pos_data in import_data.positions:
-        position = crud.upsert_position(
-            id_user=current_user.id_user,
-            ticker=pos_data.ticker,
-            quantity=pos_data.quantity,
-            buy_price=pos_data.buyPrice,
-            color=pos_data.color
-        )
-        imported_positions.append(position)
+    imported_positions = await run_in_db_executor(
+        crud.bulk_upsert_positions,
+        current_user.id_user,
+        [(p.ticker, p.quantity, p.buyPrice, p.color) for p in import_data.positions]
+    )
 
     return [PositionResponse.model_validate(p) for p in imported_positions]
 
 
 @router.get("/export")
-async def export_positions(current_user: User = Depends(get_current_user)):
+async def export_positions(
+    format: Literal["json", "ndjson", "csv"] = Query("json", description="Export format"),
+    current_user: User = Depends(get_current_user)
+):
     """
-    Export all positions as JSON.
+    Export all positions as JSON, JSON Lines or CSV.
+
+    Rows are streamed in batches as they are read from the database, so
+    memory use does not grow with the number of positions.
 
     Args:
+        format: Export format (json array, ndjson or csv)
         current_user: Current authenticated user
 
     Returns:
-        List of positions in JSON-compatible format
-    """
-    positions = crud.get_user_positions(current_user.id_user)
-
-    return [
-        {
-            "ticker": p.ticker,
-            "quantity": float(p.quantity),
-            "buyPrice": float(p.buy_price),
-            "color": p.color
-        }
-        for p in positions
-    ]
+        Streaming response of positions in the import format
+    """
+    rows = crud.iter_user_positions(current_user.id_user)
+    headers = {"Content-Disposition": f'attachment; filename="positions.{format}"'}
+
+    return StreamingResponse(
+        stream_export(rows, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
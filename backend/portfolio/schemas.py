@@ -51,6 +51,14 @@ class PositionResponse(BaseModel):
         return float(value)
 
 
+class PositionListItem(PositionResponse):
+    """Schema for a position in the positions listing, with its ticker metadata."""
+
+    name: Optional[str] = None
+    currency: Optional[str] = None
+    exchange: Optional[str] = None
+
+
 class PositionImport(BaseModel):
     """Schema for importing a position from JSON."""
 
@@ -0,0 +1 @@
+# Projection module
@@ -0,0 +1,60 @@
+"""
+Vectorized portfolio projection engine.
+"""
+import numpy as np
+import pandas as pd
+
+
+DAYS_PER_YEAR = 365.25
+
+
+def calculate_cagr(hist: pd.DataFrame) -> float:
+    """
+    Calculate the Compound Annual Growth Rate of a price history.
+
+    The duration is measured between the first and last bar dates, so the
+    result does not depend on the bar interval.
+
+    Args:
+        hist: Historical price data with a Close column, sorted by date
+
+    Returns:
+        CAGR as a decimal (e.g., 0.05 for 5% annual growth), 0 if not computable
+    """
+    if len(hist) < 2:
+        return 0.0
+
+    start_price = float(hist['Close'].iloc[0])
+    end_price = float(hist['Close'].iloc[-1])
+    years = (hist.index[-1] - hist.index[0]).days / DAYS_PER_YEAR
+
+    if start_price <= 0 or end_price <= 0 or years <= 0:
+        return 0.0
+    return (end_price / start_price) ** (1 / years) - 1
+
+
+def project_values(
+    values: np.ndarray,
+    annual_returns: np.ndarray,
+    years: int,
+    dividend_yields: np.ndarray = None
+) -> np.ndarray:
+    """
+    Project position values over time as one positions x years matrix.
+
+    Args:
+        values: Current value of each position, shape (positions,)
+        annual_returns: Annual price return of each position as a decimal
+        years: Number of years to project
+        dividend_yields: Annual dividend yield of each position as a decimal,
+            reinvested every year (omit to project price growth only)
+
+    Returns:
+        Matrix of shape (positions, years + 1); column y is the value after y years
+    """
+    growth = 1 + np.asarray(annual_returns, dtype=float)
+    if dividend_yields is not None:
+        growth = growth + np.asarray(dividend_yields, dtype=float)
+
+    exponents = np.arange(years + 1)
+    return np.asarray(values, dtype=float)[:, None] * growth[:, None] ** exponents[None, :]
@@ -0,0 +1,163 @@
+"""
+Monte Carlo portfolio projection by bootstrapping historical monthly returns.
+
+Simulations run in a process pool. This module only depends on NumPy so that
+worker processes start quickly.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import numpy as np
+
+
+MONTHS_PER_YEAR = 12
+PERCENTILES = (5, 50, 95)
+
+# Minimum number of paths per worker task (smaller chunks cost more in overhead than they save)
+MIN_PATHS_PER_CHUNK = 2000
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Get the shared simulation process pool, creating it on first use.
+
+    Workers are spawned rather than forked, since the server process runs
+    threads whose locks must not be copied into children.
+
+    Args:
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Process pool executor
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Shut down the simulation process pool, if started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def simulate_paths(
+    monthly_returns: np.ndarray,
+    values: np.ndarray,
+    monthly_dividend_yields: np.ndarray,
+    years: int,
+    paths: int,
+    seed: np.random.SeedSequence
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate portfolio value paths by resampling whole historical months.
+
+    Every path draws one historical month per simulated month and applies that
+    month's returns to all positions at once, which keeps the cross-asset
+    correlation of the history.
+
+    Args:
+        monthly_returns: Historical monthly returns, shape (months, positions)
+        values: Current value of each position, shape (positions,)
+        monthly_dividend_yields: Monthly dividend yield of each position as a decimal
+        years: Number of years to simulate
+        paths: Number of paths to simulate
+        seed: Seed of the random generator
+
+    Returns:
+        Tuple of (with_dividends, without_dividends) portfolio totals,
+        each of shape (paths, years + 1)
+    """
+    rng = np.random.default_rng(seed)
+    growth = 1 + monthly_returns
+
+    with_div = np.tile(values, (paths, 1))
+    without_div = with_div.copy()
+    with_div_totals = np.empty((paths, years + 1), dtype=np.float32)
+    without_div_totals = np.empty((paths, years + 1), dtype=np.float32)
+    with_div_totals[:, 0] = without_div_totals[:, 0] = values.sum()
+
+    for month in range(1, years * MONTHS_PER_YEAR + 1):
+        if len(growth):
+            sampled = growth[rng.integers(len(growth), size=paths)]
+            without_div *= sampled
+            with_div *= sampled + monthly_dividend_yields
+        else:
+            with_div *= 1 + monthly_dividend_yields
+
+        if month % MONTHS_PER_YEAR == 0:
+            year = month // MONTHS_PER_YEAR
+            with_div_totals[:, year] = with_div.sum(axis=1)
+            without_div_totals[:, year] = without_div.sum(axis=1)
+
+    return with_div_totals, without_div_totals
+
+
+async def run_simulation(
+    monthly_returns: np.ndarray,
+    values: np.ndarray,
+    dividend_yields: np.ndarray,
+    years: int,
+    paths: int,
+    seed: int,
+    max_workers: Optional[int] = None
+) -> dict:
+    """
+    Run a Monte Carlo projection split across the process pool.
+
+    Args:
+        monthly_returns: Historical monthly returns, shape (months, positions)
+        values: Current value of each position, shape (positions,)
+        dividend_yields: Annual dividend yield of each position as a decimal
+        years: Number of years to simulate
+        paths: Total number of paths
+        seed: Seed making the simulation reproducible
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Dictionary of percentile arrays of shape (years + 1,), keyed
+        "withDividendsP5", "withDividendsP50", ..., "withoutDividendsP95"
+    """
+    pool = get_process_pool(max_workers)
+    workers = max_workers or os.cpu_count() or 1
+    chunks = max(1, min(workers, paths // MIN_PATHS_PER_CHUNK))
+    chunk_paths = np.array_split(np.arange(paths), chunks)
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+
+    monthly_returns = np.asarray(monthly_returns, dtype=float)
+    values = np.asarray(values, dtype=float)
+    monthly_dividend_yields = np.asarray(dividend_yields, dtype=float) / MONTHS_PER_YEAR
+
+    loop = asyncio.get_running_loop()
+    try:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                pool, simulate_paths,
+                monthly_returns, values, monthly_dividend_yields, years, len(chunk), chunk_seed
+            )
+            for chunk, chunk_seed in zip(chunk_paths, seeds)
+        ))
+    except BrokenProcessPool:
+        # A worker died: drop the pool so the next simulation starts a fresh one
+        shutdown_process_pool()
+        raise
+
+    with_div = np.concatenate([with_div for with_div, _ in results])
+    without_div = np.concatenate([without_div for _, without_div in results])
+
+    bands = {}
+    for name, totals in (("withDividends", with_div), ("withoutDividends", without_div)):
+        for percentile, band in zip(PERCENTILES, np.percentile(totals, PERCENTILES, axis=0)):
+            bands[f"{name}P{percentile}"] = band
+    return bands
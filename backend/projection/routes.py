@@ -0,0 +1,214 @@
+"""
+Portfolio projection API routes.
+"""
+import logging
+from functools import partial
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, Query
+from config import settings
+from metrics import InstrumentedRoute
+from timing import span
+from auth.models import User
+from auth.dependencies import get_current_user
+from market import store
+from market.executor import run_in_executor, gather_per_ticker
+from market.routes import (
+    fetch_quote, normalize_ticker, prefetch_quote_histories, prefetch_price_bars,
+    FIVE_YEAR_PERIOD, MONTHLY_INTERVAL
+)
+from portfolio import crud
+from projection.engine import calculate_cagr, project_values
+from projection.montecarlo import run_simulation
+from projection.schemas import ProjectionResponse, MonteCarloResponse
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/projection", tags=["Projection"], route_class=InstrumentedRoute)
+
+
+def _position_inputs(ticker: str, histories: Dict[str, pd.DataFrame]) -> tuple[Optional[float], float, pd.DataFrame]:
+    """
+    Gather the market inputs of a position's projection (blocking).
+
+    Args:
+        ticker: Stock ticker symbol
+        histories: Recent price histories from prefetch_quote_histories
+
+    Returns:
+        Tuple of (current_price or None, dividend_yield as a decimal,
+        last 5 years of monthly bars)
+    """
+    current_price, dividend_yield, hist = None, 0.0, pd.DataFrame(columns=['Close'])
+
+    try:
+        quote = fetch_quote(ticker, hist=histories.get(normalize_ticker(ticker)))
+        if quote is not None:
+            current_price = quote["currentPrice"]
+            dividend_yield = (quote["dividendYield"] or 0) / 100
+    except Exception as e:
+        logger.warning(f"No quote for projection of {ticker}: {str(e)}")
+
+    try:
+        hist = store.get_price_bars(normalize_ticker(ticker), FIVE_YEAR_PERIOD, MONTHLY_INTERVAL)
+    except Exception as e:
+        logger.warning(f"No history for projection of {ticker}: {str(e)}")
+
+    return current_price, dividend_yield, hist
+
+
+async def _portfolio_inputs(current_user: User) -> tuple[List[str], np.ndarray, np.ndarray, List[pd.DataFrame]]:
+    """
+    Gather the projection inputs of every position of a user.
+
+    Args:
+        current_user: Current authenticated user
+
+    Returns:
+        Tuple of (tickers, current values, dividend yields as decimals, monthly bars per position)
+    """
+    positions = await run_in_executor(crud.get_user_positions, current_user.id_user)
+    tickers = [p.ticker for p in positions]
+
+    # Batched downloads of missing prices and monthly bars
+    quote_histories = await run_in_executor(prefetch_quote_histories, tickers)
+    await run_in_executor(prefetch_price_bars, tickers, FIVE_YEAR_PERIOD, MONTHLY_INTERVAL)
+    inputs = await gather_per_ticker(partial(_position_inputs, histories=quote_histories), tickers)
+
+    values = np.array([
+        (current_price or float(p.buy_price)) * float(p.quantity)
+        for p, (current_price, _, _) in zip(positions, inputs)
+    ], dtype=float)
+    dividend_yields = np.array([dividend_yield for _, dividend_yield, _ in inputs], dtype=float)
+    return tickers, values, dividend_yields, [hist for _, _, hist in inputs]
+
+
+def _monthly_returns(histories: List[pd.DataFrame]) -> np.ndarray:
+    """
+    Build the matrix of historical monthly returns over the months common to all positions.
+
+    Positions without history get zero returns.
+
+    Args:
+        histories: Monthly bars per position
+
+    Returns:
+        Matrix of shape (months, positions)
+    """
+    with_history = [i for i, hist in enumerate(histories) if len(hist) >= 2]
+    if not with_history:
+        return np.zeros((0, len(histories)))
+
+    closes = pd.concat(
+        [histories[i]['Close'].rename(i) for i in with_history],
+        axis=1, join='inner'
+    )
+    returns = closes.pct_change().iloc[1:].dropna()
+
+    matrix = np.zeros((len(returns), len(histories)))
+    matrix[:, with_history] = returns.to_numpy(dtype=float)
+    return matrix
+
+
+@router.get("", response_model=ProjectionResponse)
+async def get_projection(
+    years: int = Query(5, ge=1, le=100),
+    detailed: bool = False,
+    reinvest_dividends: bool = Query(False, alias="reinvestDividends"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Project the value of the current user's portfolio.
+
+    Each position grows at the CAGR of its last 5 years of monthly history,
+    plus its average dividend yield when dividends are reinvested.
+
+    Args:
+        years: Number of years to project
+        detailed: If true, return one value per position; otherwise portfolio totals
+            with and without reinvested dividends
+        reinvest_dividends: Include reinvested dividends in the detailed values
+        current_user: Current authenticated user
+
+    Returns:
+        Annual returns per ticker and one projection point per year
+    """
+    tickers, values, dividend_yields, histories = await _portfolio_inputs(current_user)
+    with span("pandas"):
+        annual_returns = np.array([calculate_cagr(hist) for hist in histories], dtype=float)
+
+    if detailed:
+        matrix = project_values(
+            values, annual_returns, years,
+            dividend_yields if reinvest_dividends else None
+        )
+        projection = [
+            {"year": year, **dict(zip(tickers, column))}
+            for year, column in enumerate(matrix.T.tolist())
+        ]
+    else:
+        with_dividends = project_values(values, annual_returns, years, dividend_yields).sum(axis=0)
+        without_dividends = project_values(values, annual_returns, years).sum(axis=0)
+        projection = [
+            {"year": year, "withDividends": with_div, "withoutDividends": without_div}
+            for year, (with_div, without_div) in enumerate(zip(with_dividends.tolist(), without_dividends.tolist()))
+        ]
+
+    return ProjectionResponse(
+        years=years,
+        detailed=detailed,
+        reinvestDividends=reinvest_dividends,
+        returns=dict(zip(tickers, annual_returns.tolist())),
+        projection=projection
+    )
+
+
+@router.get("/montecarlo", response_model=MonteCarloResponse)
+async def get_monte_carlo_projection(
+    years: int = Query(5, ge=1, le=100),
+    paths: int = Query(settings.MONTE_CARLO_DEFAULT_PATHS, ge=100, le=settings.MONTE_CARLO_MAX_PATHS),
+    seed: Optional[int] = Query(None, ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Project the value of the current user's portfolio with a Monte Carlo simulation.
+
+    Each path resamples whole historical months (all positions together, keeping
+    their correlation) from the last 5 years of monthly history.
+
+    Args:
+        years: Number of years to project
+        paths: Number of simulated paths
+        seed: Random seed (a random one is drawn and returned if omitted)
+        current_user: Current authenticated user
+
+    Returns:
+        P5/P50/P95 portfolio value bands per year, with and without reinvested dividends
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+
+    tickers, values, dividend_yields, histories = await _portfolio_inputs(current_user)
+    with span("pandas"):
+        monthly_returns = _monthly_returns(histories)
+
+    bands = await run_simulation(
+        monthly_returns, values, dividend_yields, years, paths, seed,
+        max_workers=settings.MONTE_CARLO_WORKERS
+    )
+
+    projection = [
+        {"year": year, **{name: float(band[year]) for name, band in bands.items()}}
+        for year in range(years + 1)
+    ]
+
+    return MonteCarloResponse(
+        years=years,
+        paths=paths,
+        seed=seed,
+        historicalMonths=len(monthly_returns),
+        projection=projection
+    )
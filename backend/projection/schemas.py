@@ -0,0 +1,25 @@
+"""
+Pydantic schemas for portfolio projections.
+"""
+from typing import Dict, List, Union
+from pydantic import BaseModel
+
+
+class ProjectionResponse(BaseModel):
+    """Schema for projection response."""
+
+    years: int
+    detailed: bool
+    reinvestDividends: bool
+    returns: Dict[str, float]  # Annual return (CAGR) per ticker, as a decimal
+    projection: List[Dict[str, Union[int, float]]]  # One point per year
+
+
+class MonteCarloResponse(BaseModel):
+    """Schema for Monte Carlo projection response."""
+
+    years: int
+    paths: int
+    seed: int
+    historicalMonths: int  # Number of historical months resampled
+    projection: List[Dict[str, Union[int, float]]]  # Percentile bands, one point per year
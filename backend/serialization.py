@@ -0,0 +1,53 @@
+"""
+Fast JSON serialization of API responses (orjson).
+"""
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from timing import span
+
+
+def _default(value: Any) -> Any:
+    """
+    Serialize types orjson does not handle natively.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        JSON-compatible replacement
+
+    Raises:
+        TypeError: If the type is not supported
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        # datetime subclasses such as pandas Timestamp
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    Decimals are written as floats, datetimes in ISO 8601 format, NumPy
+    scalars and arrays as numbers and lists, and NaN as null.
+
+    Args:
+        content: JSON-compatible content
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialization"):
+            return dumps(content)
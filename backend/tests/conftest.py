@@ -0,0 +1,42 @@
+"""
+Shared fixtures: the application on a throwaway SQLite database.
+"""
+import os
+import tempfile
+import uuid
+import pytest
+
+# Settings are read at import time, before the application modules load
+_db_dir = tempfile.mkdtemp(prefix="pea-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("QUOTE_REFRESH_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Client running the application lifespan once for the whole session."""
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def register(client):
+    """Register a new user and return (id_user, authorization headers)."""
+    def register():
+        name = f"user{uuid.uuid4().hex[:12]}"
+        response = client.post(
+            "/auth/register",
+            json={"email": f"{name}@example.com", "username": name, "password": "password-123456"},
+        )
+        assert response.status_code == 201, response.text
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        me = client.get("/auth/me", headers=headers)
+        assert me.status_code == 200, me.text
+        return me.json()["id"], headers
+
+    return register
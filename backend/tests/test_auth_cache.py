@@ -0,0 +1,42 @@
+"""
+Tests for the invalidation of cached users on writes.
+"""
+from auth.models import User
+
+
+def test_bulk_update_drops_cached_user(client, register):
+    id_user, headers = register()
+    # Cached by the first request
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    User.update(is_active=False).where(User.id_user == id_user).execute()
+
+    assert client.get("/auth/me", headers=headers).status_code == 403
+
+
+def test_update_without_where_drops_every_cached_user(client, register):
+    _, headers = register()
+    _, other_headers = register()
+
+    User.update(username=User.username.concat("-renamed")).execute()
+
+    assert client.get("/auth/me", headers=headers).json()["username"].endswith("-renamed")
+    assert client.get("/auth/me", headers=other_headers).json()["username"].endswith("-renamed")
+
+
+def test_bulk_delete_drops_cached_user(client, register):
+    id_user, headers = register()
+
+    User.delete().where(User.id_user == id_user).execute()
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_save_drops_cached_user(client, register):
+    id_user, headers = register()
+
+    user = User.get_by_id(id_user)
+    user.username = f"{user.username}-saved"
+    user.save()
+
+    assert client.get("/auth/me", headers=headers).json()["username"] == user.username
@@ -0,0 +1,42 @@
+"""
+Tests for the password hashing pool.
+"""
+import asyncio
+import threading
+import pytest
+from auth.security import PasswordHasher, PasswordHasherBusy
+
+
+def test_cancelled_caller_keeps_slot_until_job_finishes():
+    hasher = PasswordHasher(workers=1, queue_timeout=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+        return "hashed"
+
+    async def scenario():
+        caller = asyncio.create_task(hasher.run(job))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # The job still occupies the only worker
+        assert hasher._slots.locked()
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.run(job)
+        assert hasher.completed == 0
+
+        release.set()
+        assert await hasher.run(lambda: "next") == "next"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        hasher.shutdown()
+    assert hasher.completed == 2
+    assert hasher.rejected == 1
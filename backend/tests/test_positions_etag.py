@@ -0,0 +1,48 @@
+"""
+Tests for the ETag of the positions listing.
+"""
+import uuid
+from datetime import datetime
+import pytest
+from market import metadata
+from market.models import TickerMetadata
+from market.routes import normalize_ticker
+
+
+@pytest.fixture(autouse=True)
+def no_metadata_refresh(monkeypatch):
+    """Keep the background metadata worker off the upstream."""
+    monkeypatch.setattr(metadata, "schedule_refresh", lambda symbols: None)
+
+
+def _add_position(client, headers) -> str:
+    ticker = f"T{uuid.uuid4().hex[:6].upper()}"
+    response = client.post(
+        "/portfolio/positions",
+        json={"ticker": ticker, "quantity": "1", "buyPrice": "10"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return normalize_ticker(ticker)
+
+
+def _store_metadata(symbol: str):
+    TickerMetadata.replace(symbol=symbol, name=symbol, refreshed_at=datetime.now()).execute()
+
+
+def test_listing_etag_only_follows_own_tickers_metadata(client, register):
+    _, headers = register()
+    _, other_headers = register()
+    symbol = _add_position(client, headers)
+    other_symbol = _add_position(client, other_headers)
+
+    etag = client.get("/portfolio/positions", headers=headers).headers["etag"]
+
+    _store_metadata(other_symbol)
+    response = client.get("/portfolio/positions", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    _store_metadata(symbol)
+    response = client.get("/portfolio/positions", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == symbol
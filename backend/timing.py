@@ -0,0 +1,203 @@
+"""
+Per-request timing spans, reported in a Server-Timing header or a debug trailer.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterator, Optional
+from urllib.parse import parse_qs
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Query parameter value requesting the debug trailer (?debug=timing)
+DEBUG_TIMING = "timing"
+
+
+class RequestTimings:
+    """
+    Time spent per span name during one request.
+
+    Spans may run concurrently in worker threads, so a span's total can
+    exceed the request's wall time.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._spans: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        """
+        Add the duration of one span occurrence.
+
+        Args:
+            name: Span name (e.g. "db")
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            span = self._spans.setdefault(name, [0.0, 0])
+            span[0] += seconds
+            span[1] += 1
+
+    def summary(self) -> dict:
+        """
+        Get the spans recorded so far.
+
+        Returns:
+            Dictionary with the elapsed time and, per span, its total time and count
+        """
+        with self._lock:
+            spans = {
+                name: {"ms": round(seconds * 1000, 3), "count": count}
+                for name, (seconds, count) in self._spans.items()
+            }
+        return {"totalMs": round((time.perf_counter() - self.start) * 1000, 3), "spans": spans}
+
+    def server_timing(self) -> str:
+        """
+        Format the spans as a Server-Timing header value.
+
+        Returns:
+            Header value with one metric per span plus the total
+        """
+        summary = self.summary()
+        metrics = [
+            f'{name};dur={span["ms"]};desc="{span["count"]}x"'
+            for name, span in summary["spans"].items()
+        ]
+        metrics.append(f'total;dur={summary["totalMs"]}')
+        return ", ".join(metrics)
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record(name: str, seconds: float):
+    """
+    Record a span of the current request (no-op outside timed requests).
+
+    Args:
+        name: Span name
+        seconds: Duration in seconds
+    """
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a block as a span of the current request.
+
+    Args:
+        name: Span name (auth, db, upstream, pandas, serialization)
+    """
+    if _request_timings.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def _debug_requested(scope: Scope) -> bool:
+    """Check whether a request asks for the timing debug trailer."""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return DEBUG_TIMING in query.get("debug", [])
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware reporting the spans of each request.
+
+    When enabled, every response carries a Server-Timing header. Independently,
+    an admin passing ?debug=timing gets the header and a JSON response wrapped
+    as {"data": <response>, "timing": <spans>}.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        enabled: bool,
+        is_admin: Callable[[Headers], Awaitable[bool]],
+        allowed_origins: str = ""
+    ):
+        """
+        Args:
+            app: ASGI application
+            enabled: Add the Server-Timing header to every response
+            is_admin: Coroutine function telling from request headers whether the caller is an admin
+            allowed_origins: Origins allowed to read the timings (Timing-Allow-Origin)
+        """
+        self.app = app
+        self.enabled = enabled
+        self.is_admin = is_admin
+        self.allowed_origins = allowed_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = _debug_requested(scope) and await self.is_admin(Headers(scope=scope))
+        if not (self.enabled or debug):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        try:
+            if debug:
+                await self._call_with_trailer(scope, receive, send, timings)
+            else:
+                await self.app(scope, receive, self._send_with_header(send, timings))
+        finally:
+            _request_timings.reset(token)
+
+    def _send_with_header(self, send: Send, timings: RequestTimings) -> Send:
+        """Wrap send to add the Server-Timing header to the response."""
+        async def send_with_header(message: Message):
+            if message["type"] == "http.response.start":
+                self._add_header(message, timings)
+            await send(message)
+        return send_with_header
+
+    def _add_header(self, message: Message, timings: RequestTimings):
+        """Add the Server-Timing headers to a response start message."""
+        headers = MutableHeaders(raw=message["headers"])
+        headers["Server-Timing"] = timings.server_timing()
+        if self.allowed_origins:
+            headers["Timing-Allow-Origin"] = self.allowed_origins
+
+    async def _call_with_trailer(self, scope: Scope, receive: Receive, send: Send, timings: RequestTimings):
+        """Run the request, buffering its response to append the timing trailer."""
+        start_message: Optional[Message] = None
+        body = []
+
+        async def buffer(message: Message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, buffer)
+        if start_message is None:
+            return
+
+        content = b"".join(body)
+        headers = MutableHeaders(raw=start_message["headers"])
+        if headers.get("content-type", "").startswith("application/json") and content:
+            content = orjson.dumps({"data": orjson.loads(content), "timing": timings.summary()})
+            headers["Content-Length"] = str(len(content))
+        self._add_header(start_message, timings)
+
+        await send(start_message)
+        await send({"type": "http.response.body", "body": content})
+
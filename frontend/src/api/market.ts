@@ -10,6 +10,8 @@ export interface Quote {
     currentPrice: number;
     dividendYield: number;
     name: string;
+    asOf?: string;
+    stale?: boolean;
     error?: string;
 }
 